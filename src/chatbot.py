@@ -7,10 +7,13 @@ logging.getLogger("httpx").setLevel(logging.WARNING)  # Suppress Gradio version
 logging.getLogger("gradio").setLevel(logging.WARNING)
 
 import os
+import queue
 import subprocess
 import sys
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Generator, List, Tuple
 
 import gradio as gr
@@ -19,7 +22,7 @@ import gradio as gr
 sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
 
 from src.utils.config import config
-from src.utils.rag_utils import RAGPipeline, detect_query_type
+from src.utils.rag_utils import RAGPipeline, ResponseGenerator, detect_query_type
 
 
 class CodeExecutor:
@@ -113,23 +116,305 @@ except Exception as e:
             os.unlink(script_path)  # Clean up temp file
 
 
+# Labels used to tag retrieved documents and search progress by collection
+COLLECTION_DISPLAY_NAMES = {
+    "api_docs_functions": "📘 API Function",
+    "api_docs_classes": "📗 API Class",
+    "api_docs_modules": "📙 Module",
+    "reachy2_sdk": "💻 SDK Example",
+    "vision_examples": "👁️ Vision Example",
+    "reachy2_tutorials": "📚 Tutorial",
+    "reachy2_docs": "📖 Documentation",
+}
+SEARCH_LOG_TEMPLATE = "✓ Found {n} matches in {name} ({t:.2f}s)"
+
+# Example queries shown in the UI, as (tab, label, queries)
+EXAMPLE_QUERIES = [
+    (
+        "Basic Movement",
+        "Basic Movement Code",
+        [
+            "Show me code to move Reachy's right arm to a specific position",
+            "How to make Reachy's head track an object?",
+            "Code example for controlling the mobile base movement",
+            "How to get current joint positions and move relative to them?",
+        ],
+    ),
+    (
+        "Object Manipulation",
+        "Object Manipulation Code",
+        [
+            "Code to control the gripper with force feedback",
+            "Example of pick and place operation with error handling",
+            "How to implement a grasping sequence with position checks",
+            "Code to detect and track objects with the cameras",
+        ],
+    ),
+    (
+        "Error Handling",
+        "Error Handling Code",
+        [
+            "Show me proper error handling for arm movements",
+            "How to implement safety checks in gripper control",
+            "Code example for handling vision detection failures",
+            "Example of graceful error recovery during motion",
+        ],
+    ),
+    (
+        "Advanced Control",
+        "Advanced Control Code",
+        [
+            "Code for smooth trajectory generation",
+            "How to implement velocity control for the mobile base",
+            "Example of coordinated arm and head movement",
+            "Code for visual servoing with the cameras",
+        ],
+    ),
+    (
+        "Integration",
+        "Integration Examples",
+        [
+            "How to combine vision and arm control in one script",
+            "Example of a complete pick-and-place program",
+            "Code to integrate mobile base with arm movements",
+            "How to create a reusable movement sequence",
+        ],
+    ),
+]
+ALL_EXAMPLE_QUERIES = [q for _, _, queries in EXAMPLE_QUERIES for q in queries]
+
+
+def extract_latest_code(history) -> Tuple[str, bool]:
+    """Extract the most recent code block from chat history."""
+    if not history:
+        return "No code found in conversation history.", False
+
+    # Get the last assistant message
+    for msg in reversed(history):
+        content = (
+            msg.get("content", "")
+            if isinstance(msg, dict)
+            else getattr(msg, "content", "")
+        )
+        role = (
+            msg.get("role", "") if isinstance(msg, dict) else getattr(msg, "role", "")
+        )
+
+        if role == "assistant" and "```python" in content:
+            # Extract code between ```python and ```
+            start = content.find("```python") + 9
+            end = content.find("```", start)
+            if start > 8 and end > start:
+                return content[start:end].strip(), True
+    return "No code found in conversation history.", False
+
+
+def conversation_from_chat(history) -> List[dict]:
+    """Turn a session's chat into the model's conversation history.
+
+    Each question is paired with its final answer. Status messages, which
+    carry a metadata title, and questions that ended in an error are left out.
+    """
+    conversation = []
+    question = None
+    for msg in history or []:
+        if isinstance(msg, dict):
+            role, content = msg.get("role", ""), msg.get("content", "")
+            metadata = msg.get("metadata")
+        else:
+            role, content = getattr(msg, "role", ""), getattr(msg, "content", "")
+            metadata = getattr(msg, "metadata", None)
+
+        if not isinstance(content, str) or (metadata or {}).get("title"):
+            continue
+        if role == "user":
+            question = content
+        elif role == "assistant" and question is not None:
+            conversation.append({"role": "user", "content": question})
+            conversation.append({"role": "assistant", "content": content})
+            question = None
+    return conversation
+
+
+def execute_on_virtual(history) -> str:
+    """Execute the most recent code block on virtual Reachy."""
+    try:
+        code, found = extract_latest_code(history)
+        if not found:
+            return "⚠️ " + code
+
+        output, success = CodeExecutor.execute_code(code)
+        if success:
+            return f"✅ Code executed successfully on virtual Reachy:\n\n{output}"
+        else:
+            return output  # Error message already formatted
+    except Exception as e:
+        return f"❌ An unexpected error occurred: {str(e)}"
+
+
+async def set_processing_status() -> str:
+    """Status shown while a query runs; async so it stays on the event loop."""
+    return "Processing query..."
+
+
+async def set_ready_status() -> str:
+    """Status shown once a query has finished."""
+    return "Ready for your next question!"
+
+
+def clear_chat():
+    """Reset the chat, query box, status and execution output.
+
+    The chat is the session's conversation history, so the next question starts
+    a fresh conversation. Other sessions and the shared response cache are left
+    alone.
+    """
+    return (
+        None,
+        "",
+        "Ready to assist with your Reachy2 questions!",
+        "Code execution output will appear here...",
+    )
+
+
 class ChatbotInterface:
+    # Minimum seconds between intermediate chat re-renders while streaming
+    MIN_YIELD_INTERVAL = 0.05
+    # Longest wait for a token before the pending status is refreshed
+    HEARTBEAT_INTERVAL = 0.5
+
     def __init__(self):
-        # Initialize the RAG pipeline once
-        print("Initializing Reachy2 Expert Agent...")
-        self.pipeline = RAGPipeline()
         self.code_executor = CodeExecutor()
 
+        # Reused across requests so searches don't pay for thread start-up
+        self.search_executor = ThreadPoolExecutor(
+            max_workers=config.rag_config.SEARCH_WORKERS
+        )
+
+        # Load the RAG pipeline in the background so the UI renders immediately
+        self.pipeline = None
+        self.pipeline_error = None
+        self.pipeline_ready = threading.Event()
+        threading.Thread(target=self._load_pipeline, daemon=True).start()
+
+    def _load_pipeline(self):
+        """Initialize the RAG pipeline once and signal waiting requests."""
+        print("Initializing Reachy2 Expert Agent...")
+        try:
+            pipeline = RAGPipeline()
+        except Exception as e:
+            self.pipeline_error = e
+            print(f"Error initializing RAG pipeline: {str(e)}")
+            self.pipeline_ready.set()
+            return
+
+        # Warm the models and indexes before the first request is let through
+        try:
+            pipeline.warmup()
+        except Exception as e:
+            print(f"Warning: RAG pipeline warmup failed: {str(e)}")
+
+        self.pipeline = pipeline
+        self.pipeline_ready.set()
+
+        # Encode the showcased example queries so clicking one does not wait
+        # on the embedding model; requests are already served meanwhile
+        threading.Thread(
+            target=self._prewarm_examples, args=(pipeline,), daemon=True
+        ).start()
+
+    @staticmethod
+    def _prewarm_examples(pipeline: RAGPipeline):
+        """Fill the embedding cache with the example queries."""
+        try:
+            pipeline.prewarm_queries(ALL_EXAMPLE_QUERIES)
+        except Exception as e:
+            print(f"Warning: Could not pre-encode example queries: {str(e)}")
+
+    def get_pipeline(self) -> RAGPipeline:
+        """Wait for the background initialization and return the pipeline."""
+        self.pipeline_ready.wait()
+        if self.pipeline is None:
+            raise RuntimeError(f"RAG pipeline failed to load: {self.pipeline_error}")
+        return self.pipeline
+
+    def wait_until_ready(self) -> str:
+        """Block until the pipeline is loaded and return the status message."""
+        try:
+            self.get_pipeline()
+        except RuntimeError as e:
+            return f"❌ {str(e)}"
+        return "Ready to assist with your Reachy2 questions!"
+
+    def answer_example(self, query: str) -> List[dict]:
+        """Answer an example query as a fresh conversation, for example caching.
+
+        Earlier questions and the response cache are left out so that nothing
+        from other conversations leaks into answers that Gradio stores and
+        replays.
+        """
+        messages = []
+        for messages in self.stream_response(query, [], use_history=False):
+            pass
+        return messages
+
+    @staticmethod
+    def _search_one(
+        pipeline: RAGPipeline,
+        collection: str,
+        query: str,
+        weight: float,
+        label: str,
+        query_embedding: List[float],
+    ) -> Tuple[List[Tuple[str, float]], float]:
+        """Search one collection and return its documents and elapsed time."""
+        start = time.perf_counter()
+        documents = pipeline.search_collection(
+            collection, query, weight, label=label, query_embedding=query_embedding
+        )
+        return documents, time.perf_counter() - start
+
+    @staticmethod
+    def _pump_tokens(
+        tokens: Generator[str, None, None], out: queue.Queue, stop: threading.Event
+    ):
+        """Move tokens into a queue, ending with None or the raised exception.
+
+        Once stop is set the stream is abandoned at the next token.
+        """
+        try:
+            for token in tokens:
+                if stop.is_set():
+                    return
+                out.put(token)
+            out.put(None)
+        except Exception as e:
+            out.put(e)
+        finally:
+            # Closing the generator closes the HTTP response mid-stream, and
+            # an abandoned answer is not added to any history
+            tokens.close()
+
     def stream_response(
-        self, query: str, history: List[dict]
+        self, query: str, history: List[dict], use_history: bool = True
     ) -> Generator[List[dict], None, None]:
-        """Stream the response with reasoning steps and code generation."""
+        """Stream the response with reasoning steps and code generation.
+
+        The model sees this session's earlier questions and answers, taken
+        from the chat history. With use_history=False it sees neither those
+        nor cached answers.
+        """
+        # Tells the token reader to give up once this generator is closed,
+        # e.g. when the client disconnects
+        stop_stream = threading.Event()
         try:
-            start_time = time.time()
+            start_time = time.perf_counter()
+            # Duration of each phase, summarized in the final status
+            timings = {}
 
-            # Start with the user's query
+            # Start with the user's query, shown together with the thinking
+            # message in the first update
             messages = history + [gr.ChatMessage(role="user", content=query)]
-            yield messages
 
             # Add initial thinking message with timing
             messages.append(
@@ -146,15 +431,23 @@ class ChatbotInterface:
                                 f"Context: {len(history)} previous messages",
                             ]
                         ),
-                        "duration": time.time() - start_time,
+                        "duration": time.perf_counter() - start_time,
                     },
                 )
             )
             yield messages
 
+            # Requests arriving during startup wait for the models to finish loading
+            pipeline = self.get_pipeline()
+
+            # Each session's own chat is its conversation history, so
+            # concurrent users never see each other's questions
+            conversation = conversation_from_chat(history) if use_history else []
+
             # Query type detection
             query_type = detect_query_type(query)
-            detection_time = time.time() - start_time
+            detection_time = time.perf_counter() - start_time
+            timings["detection"] = detection_time
             messages[-1] = gr.ChatMessage(
                 role="assistant",
                 content=f"This appears to be a {query_type} query.",
@@ -171,10 +464,47 @@ class ChatbotInterface:
                     "duration": detection_time,
                 },
             )
-            yield messages
 
-            # Document retrieval process
-            search_start = time.time()
+            # Answer repeated or near-identical questions from the cache.
+            # Answers depend on the conversation so far, so only turns without
+            # history read or fill the cache. Example answers, which Gradio
+            # stores and replays, are always generated afresh
+            use_cache = use_history and not conversation
+            cached_response, query_embedding = None, None
+            if use_cache:
+                cache_start = time.perf_counter()
+                cached_response, query_embedding = pipeline.lookup_cache(
+                    query, query_type
+                )
+                cache_time = time.perf_counter() - cache_start
+                timings["cache lookup"] = cache_time
+            if cached_response is not None:
+                messages.append(
+                    gr.ChatMessage(
+                        role="assistant",
+                        content="Found an answer to a matching earlier question.",
+                        metadata={
+                            "title": "💾 Cache hit",
+                            "status": "done",
+                            "log": "\n".join(
+                                [
+                                    "Skipped document search and generation",
+                                    f"Cache lookup time: {cache_time:.2f}s",
+                                ]
+                            ),
+                            "duration": cache_time,
+                        },
+                    )
+                )
+                messages.append(
+                    gr.ChatMessage(role="assistant", content=cached_response)
+                )
+                yield messages
+                return
+
+            # Document retrieval process; its first update also shows the
+            # query analysis
+            search_start = time.perf_counter()
             messages.append(
                 gr.ChatMessage(
                     role="assistant",
@@ -190,68 +520,70 @@ class ChatbotInterface:
             yield messages
 
             # Get collection weights
-            collection_weights = self.pipeline.get_collection_weights(query)
+            collection_weights = pipeline.get_collection_weights(query, query_type)
 
             # Search each collection
             all_results = []
             search_log = []
-            collection_display_names = {
-                "api_docs_functions": "📘 API Function",
-                "api_docs_classes": "📗 API Class",
-                "api_docs_modules": "📙 Module",
-                "reachy2_sdk": "💻 SDK Example",
-                "vision_examples": "👁️ Vision Example",
-                "reachy2_tutorials": "📚 Tutorial",
-                "reachy2_docs": "📖 Documentation",
-            }
-
-            for collection, weight in collection_weights.items():
-                collection_start = time.time()
-                messages[-1] = gr.ChatMessage(
-                    role="assistant",
-                    content="",
-                    metadata={
-                        "title": "📚 Document Search",
-                        "status": "pending",
-                        "log": "\n".join(
-                            [
-                                *search_log,
-                                f"Searching {collection_display_names.get(collection, collection)}...",
-                                f"Collection weight: {weight:.2f}",
-                            ]
-                        ),
-                        "duration": time.time() - search_start,
-                    },
-                )
-                yield messages
 
-                results = self.pipeline.vector_store.query_collection(
-                    collection_name=collection,
-                    query_texts=[query],
-                    n_results=config.rag_config.TOP_K_CHUNKS,
-                    embedding_function=self.pipeline.embedding_generator,
-                )
-
-                documents = results["documents"][0]
-                distances = results["distances"][0]
-
-                # Store results with their weighted scores
-                for doc, dist in zip(documents, distances):
-                    doc_with_source = f"[{collection_display_names.get(collection, collection)}] {doc}"
-                    all_results.append((doc_with_source, dist * weight))
+            # Embed the query for all collections in one batched forward pass
+            query_embeddings = pipeline.embed_queries(list(collection_weights), [query])
+
+            # Query every collection concurrently on the shared pool; Chroma's
+            # native search releases the GIL, so the searches overlap
+            futures = {
+                self.search_executor.submit(
+                    self._search_one,
+                    pipeline,
+                    collection,
+                    query,
+                    weight,
+                    COLLECTION_DISPLAY_NAMES.get(collection, collection),
+                    query_embeddings[collection][0],
+                ): collection
+                for collection, weight in collection_weights.items()
+            }
 
-                collection_time = time.time() - collection_start
+            # Report finished collections, but re-render the chat at most
+            # every MIN_YIELD_INTERVAL; the final summary below always shows
+            results_by_collection = {}
+            last_yield = 0.0
+            for future in as_completed(futures):
+                collection = futures[future]
+                documents, collection_time = future.result()
+                results_by_collection[collection] = documents
                 search_log.append(
-                    f"✓ Found {len(documents)} matches in {collection_display_names.get(collection, collection)} ({collection_time:.2f}s)"
+                    SEARCH_LOG_TEMPLATE.format(
+                        n=len(documents),
+                        name=COLLECTION_DISPLAY_NAMES.get(collection, collection),
+                        t=collection_time,
+                    )
                 )
+                # Only render the log for updates that are actually shown
+                now = time.perf_counter()
+                if now - last_yield >= self.MIN_YIELD_INTERVAL:
+                    last_yield = now
+                    messages[-1] = gr.ChatMessage(
+                        role="assistant",
+                        content="",
+                        metadata={
+                            "title": "📚 Document Search",
+                            "status": "pending",
+                            "log": "\n".join(search_log),
+                            "duration": now - search_start,
+                        },
+                    )
+                    yield messages
+
+            # Merge in collection order so ties rank the same on every run
+            for collection in collection_weights:
+                all_results.extend(results_by_collection[collection])
 
             # Sort and select top results
-            all_results.sort(key=lambda x: x[1])
-            selected_docs = [
-                doc for doc, _ in all_results[: config.rag_config.TOP_K_CHUNKS]
-            ]
+            selected_docs = pipeline.select_top_documents(all_results)
 
-            search_duration = time.time() - search_start
+            search_duration = time.perf_counter() - search_start
+            timings["search"] = search_duration
             messages[-1] = gr.ChatMessage(
                 role="assistant",
                 content="\n".join(search_log),
@@ -271,7 +603,14 @@ class ChatbotInterface:
             yield messages
 
             # Code generation process
-            generation_start = time.time()
+            generation_start = time.perf_counter()
+            generation_log = "\n".join(
+                [
+                    "Analyzing context documents...",
+                    f"Processing {len(selected_docs)} relevant sources",
+                    "Generating response...",
+                ]
+            )
             messages.append(
                 gr.ChatMessage(
                     role="assistant",
@@ -279,29 +618,77 @@ class ChatbotInterface:
                     metadata={
                         "title": "⚙️ Code Generation",
                         "status": "pending",
-                        "log": "\n".join(
-                            [
-                                "Analyzing context documents...",
-                                f"Processing {len(selected_docs)} relevant sources",
-                                "Generating response...",
-                            ]
-                        ),
+                        "log": generation_log,
                         "duration": 0.0,
                     },
                 )
             )
             yield messages
 
-            # Generate final response
-            response = self.pipeline.generator.generate_response(
-                query=query, context=selected_docs, query_type=query_type
-            )
+            # Read the API stream on a worker thread so this loop can keep the
+            # UI alive while waiting for the first and later tokens
+            tokens = queue.Queue()
+            threading.Thread(
+                target=self._pump_tokens,
+                args=(
+                    pipeline.generator.stream_response(
+                        query=query,
+                        context=selected_docs,
+                        query_type=query_type,
+                        history=conversation,
+                    ),
+                    tokens,
+                    stop_stream,
+                ),
+                daemon=True,
+            ).start()
+
+            # Stream the answer into its own message as tokens arrive,
+            # re-rendering at most every MIN_YIELD_INTERVAL
+            messages.append(gr.ChatMessage(role="assistant", content=""))
+            response = ""
+            last_yield = 0.0
+            while True:
+                try:
+                    delta = tokens.get(timeout=self.HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    # No token yet: refresh the elapsed time as a heartbeat
+                    messages[-2] = gr.ChatMessage(
+                        role="assistant",
+                        content="",
+                        metadata={
+                            "title": "⚙️ Code Generation",
+                            "status": "pending",
+                            "log": generation_log,
+                            "duration": time.perf_counter() - generation_start,
+                        },
+                    )
+                    yield messages
+                    continue
+                if delta is None:
+                    break
+                if isinstance(delta, Exception):
+                    raise delta
+
+                response += delta
+                now = time.perf_counter()
+                if now - last_yield >= self.MIN_YIELD_INTERVAL:
+                    last_yield = now
+                    messages[-1] = gr.ChatMessage(role="assistant", content=response)
+                    yield messages
+
+            if use_cache and ResponseGenerator.ERROR_PREFIX not in response:
+                pipeline.response_cache.put(
+                    query, query_type, query_embedding, response
+                )
 
-            generation_duration = time.time() - generation_start
-            total_duration = time.time() - start_time
+            end_time = time.perf_counter()
+            generation_duration = end_time - generation_start
+            total_duration = end_time - start_time
+            timings["generation"] = generation_duration
 
-            # Update the thinking status
-            messages[-1] = gr.ChatMessage(
+            # Update the thinking status and show the complete response
+            messages[-2] = gr.ChatMessage(
                 role="assistant",
                 content="Response generated successfully",
                 metadata={
@@ -313,19 +700,18 @@ class ChatbotInterface:
                             "Response generated successfully",
                             f"Generation time: {generation_duration:.2f}s",
                             f"Total processing time: {total_duration:.2f}s",
+                            "Phases: "
+                            + ", ".join(f"{k} {v:.2f}s" for k, v in timings.items()),
                         ]
                     ),
                     "duration": generation_duration,
                 },
             )
-            yield messages
-
-            # Add the final response as a separate message without metadata
-            messages.append(gr.ChatMessage(role="assistant", content=response))
+            messages[-1] = gr.ChatMessage(role="assistant", content=response)
             yield messages
 
         except Exception as e:
-            error_time = time.time() - start_time
+            error_time = time.perf_counter() - start_time
             error_msg = f"Error: {str(e)}"
             error_metadata = {
                 "title": "❌ Error",
@@ -353,6 +739,8 @@ class ChatbotInterface:
                         role="assistant", content=error_msg, metadata=error_metadata
                     )
                 ]
+        finally:
+            stop_stream.set()
 
 
 def main():
@@ -392,7 +780,7 @@ def main():
                     clear = gr.Button("Clear", scale=1)
 
                 with gr.Row():
-                    status = gr.Markdown("Ready to assist with your Reachy2 questions!")
+                    status = gr.Markdown("Warming up the models, please wait...")
 
                 with gr.Row():
                     execute_virtual = gr.Button(
@@ -440,133 +828,42 @@ def main():
         gr.Markdown("""### Example Queries""")
 
         with gr.Tabs():
-            with gr.TabItem("Basic Movement"):
-                gr.Examples(
-                    examples=[
-                        "Show me code to move Reachy's right arm to a specific position",
-                        "How to make Reachy's head track an object?",
-                        "Code example for controlling the mobile base movement",
-                        "How to get current joint positions and move relative to them?",
-                    ],
-                    inputs=query,
-                    label="Basic Movement Code",
-                )
-
-            with gr.TabItem("Object Manipulation"):
-                gr.Examples(
-                    examples=[
-                        "Code to control the gripper with force feedback",
-                        "Example of pick and place operation with error handling",
-                        "How to implement a grasping sequence with position checks",
-                        "Code to detect and track objects with the cameras",
-                    ],
-                    inputs=query,
-                    label="Object Manipulation Code",
-                )
-
-            with gr.TabItem("Error Handling"):
-                gr.Examples(
-                    examples=[
-                        "Show me proper error handling for arm movements",
-                        "How to implement safety checks in gripper control",
-                        "Code example for handling vision detection failures",
-                        "Example of graceful error recovery during motion",
-                    ],
-                    inputs=query,
-                    label="Error Handling Code",
-                )
-
-            with gr.TabItem("Advanced Control"):
-                gr.Examples(
-                    examples=[
-                        "Code for smooth trajectory generation",
-                        "How to implement velocity control for the mobile base",
-                        "Example of coordinated arm and head movement",
-                        "Code for visual servoing with the cameras",
-                    ],
-                    inputs=query,
-                    label="Advanced Control Code",
-                )
-
-            with gr.TabItem("Integration"):
-                gr.Examples(
-                    examples=[
-                        "How to combine vision and arm control in one script",
-                        "Example of a complete pick-and-place program",
-                        "Code to integrate mobile base with arm movements",
-                        "How to create a reusable movement sequence",
-                    ],
-                    inputs=query,
-                    label="Integration Examples",
-                )
-
-        # Event handlers
-        def extract_latest_code(history):
-            """Extract the most recent code block from chat history."""
-            if not history:
-                return "No code found in conversation history.", False
-
-            # Get the last assistant message
-            for msg in reversed(history):
-                content = (
-                    msg.get("content", "")
-                    if isinstance(msg, dict)
-                    else getattr(msg, "content", "")
-                )
-                role = (
-                    msg.get("role", "")
-                    if isinstance(msg, dict)
-                    else getattr(msg, "role", "")
-                )
-
-                if role == "assistant" and "```python" in content:
-                    # Extract code between ```python and ```
-                    start = content.find("```python") + 9
-                    end = content.find("```", start)
-                    if start > 8 and end > start:
-                        return content[start:end].strip(), True
-            return "No code found in conversation history.", False
-
-        def execute_on_virtual(history):
-            """Execute the most recent code block on virtual Reachy."""
-            try:
-                code, found = extract_latest_code(history)
-                if not found:
-                    return "⚠️ " + code
-
-                output, success = chatbot_interface.code_executor.execute_code(code)
-                if success:
-                    return (
-                        f"✅ Code executed successfully on virtual Reachy:\n\n{output}"
+            for tab, label, examples in EXAMPLE_QUERIES:
+                with gr.TabItem(tab):
+                    gr.Examples(
+                        examples=examples,
+                        inputs=query,
+                        outputs=chatbot,
+                        fn=chatbot_interface.answer_example,
+                        cache_examples=config.cache_examples,
+                        label=label,
                     )
-                else:
-                    return output  # Error message already formatted
-            except Exception as e:
-                return f"❌ An unexpected error occurred: {str(e)}"
 
-        # Connect event handlers
+        # Connect event handlers. Both ways of asking share the "rag"
+        # concurrency group, so at most CONCURRENCY_LIMIT answers run at once;
+        # each session sends only its own chat as history, so they can overlap
         submit_click = (
-            submit.click(fn=lambda: "Processing query...", outputs=status, queue=False)
+            submit.click(fn=set_processing_status, outputs=status, queue=False)
             .then(
                 chatbot_interface.stream_response,  # Use streaming response
                 inputs=[query, chatbot],
                 outputs=chatbot,
+                concurrency_limit=config.concurrency_limit,
+                concurrency_id="rag",
             )
-            .then(
-                fn=lambda: "Ready for your next question!", outputs=status, queue=False
-            )
+            .then(fn=set_ready_status, outputs=status, queue=False)
         )
 
         txt_submit = (
-            query.submit(fn=lambda: "Processing query...", outputs=status, queue=False)
+            query.submit(fn=set_processing_status, outputs=status, queue=False)
             .then(
                 chatbot_interface.stream_response,  # Use streaming response
                 inputs=[query, chatbot],
                 outputs=chatbot,
+                concurrency_limit=config.concurrency_limit,
+                concurrency_id="rag",
             )
-            .then(
-                fn=lambda: "Ready for your next question!", outputs=status, queue=False
-            )
+            .then(fn=set_ready_status, outputs=status, queue=False)
         )
 
         # Execute on virtual Reachy button handler
@@ -578,18 +875,13 @@ def main():
         )
 
         # Clear button handler
-        def clear_chat():
-            return (
-                None,
-                "",
-                "Ready to assist with your Reachy2 questions!",
-                "Code execution output will appear here...",
-            )
-
         clear.click(
             fn=clear_chat, outputs=[chatbot, query, status, virtual_output], queue=False
         )
 
+        # Report readiness once the background pipeline load finishes
+        iface.load(fn=chatbot_interface.wait_until_ready, outputs=status)
+
         return iface
 
 
@@ -597,5 +889,7 @@ if __name__ == "__main__":
     print("Starting Reachy2 Expert Agent Chatbot...")
     print(f"Debug mode: {config.debug}")
     iface = main()
-    iface.queue()
+    # Other queued events, such as running code on the single virtual Reachy,
+    # keep Gradio's default of one at a time
+    iface.queue(max_size=config.queue_max_size)
     iface.launch(share=False)
@@ -3,12 +3,18 @@ Utility functions for processing and managing documents, code files, and noteboo
 """
 
 from .code_utils import process_python_file
-from .doc_utils import load_documents_from_json, save_documents_to_json
-from .notebook_utils import process_notebook
+from .doc_utils import (
+    load_documents_from_json,
+    process_files_in_parallel,
+    save_documents_to_json,
+)
+from .notebook_utils import process_notebook, read_notebook_cells
 
 __all__ = [
     "save_documents_to_json",
     "load_documents_from_json",
+    "process_files_in_parallel",
     "process_python_file",
     "process_notebook",
+    "read_notebook_cells",
 ]
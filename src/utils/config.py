@@ -1,6 +1,6 @@
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Union
 
 from dotenv import load_dotenv
 
@@ -13,22 +13,42 @@ class ModelConfig:
     """Configuration for language models."""
 
     # Query decomposition model (Mistral Small)
-    QUERY_MODEL: str = (
-        "mistral-small-latest"  # Use Mistral Small for query decomposition
-    )
+    QUERY_MODEL: str = os.getenv(
+        "QUERY_MODEL", "mistral-small-latest"
+    )  # Use Mistral Small for query decomposition
     QUERY_MODEL_TEMP: float = 0.3
     QUERY_MAX_TOKENS: int = 300
 
     # Code generation model (Mistral Large)
-    CODE_MODEL: str = (
-        "mistral-large-latest"  # Use Mistral Large for better code synthesis
-    )
+    CODE_MODEL: str = os.getenv(
+        "CODE_MODEL", "mistral-large-latest"
+    )  # Use Mistral Large for better code synthesis
     CODE_MODEL_TEMP: float = 0.2  # Lower temperature for more precise code generation
     CODE_MAX_TOKENS: int = 2000  # Increased token limit for complete code examples
 
     # Embedding model
     EMBEDDING_MODEL: str = "hkunlp/instructor-xl"  # Use InstructorXL for embeddings
 
+    # Inference backend for the embedding model: "torch", or "onnx"/"openvino"
+    # (requires sentence-transformers>=3.2 with the matching optimum extra)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch")
+
+    # Quantize the embedding model's linear layers to INT8 when running on CPU.
+    # Query embeddings then differ slightly from an FP32-built index, so opt-in.
+    EMBEDDING_QUANTIZE_INT8: bool = (
+        os.getenv("EMBEDDING_QUANTIZE_INT8", "false").lower() == "true"
+    )
+    # Keep embedding weights in BF16 on CUDA devices that support it. Like INT8
+    # this shifts embeddings away from an FP32-built index, so opt-in; rebuild
+    # the vector store with the same setting when enabling it
+    EMBEDDING_BF16: bool = os.getenv("EMBEDDING_BF16", "false").lower() == "true"
+    # Texts per encoder forward pass; 0 picks a default for the device
+    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "0"))
+    # Compile the embedding transformer with torch.compile (slow first call)
+    EMBEDDING_COMPILE: bool = os.getenv("EMBEDDING_COMPILE", "false").lower() == "true"
+    # Intra-op threads for CPU inference; 0 keeps torch's default
+    TORCH_NUM_THREADS: int = int(os.getenv("TORCH_NUM_THREADS", "0"))
+
     # Re-ranking model
     RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
@@ -45,9 +65,36 @@ class RAGConfig:
     # Vector store settings
     VECTOR_STORE_DIR: str = "data/vectorstore"
 
+    # HNSW index settings applied when collections are created
+    HNSW_SETTINGS = {
+        "hnsw:space": "cosine",
+        "hnsw:batch_size": 1000,  # Brute-force buffer size before HNSW insertion
+        "hnsw:sync_threshold": 5000,  # Persist the index less often during bulk loads
+    }
+
     # Retrieval settings
     TOP_K_CHUNKS: int = 5
     RERANK_TOP_K: int = 3
+    SEARCH_WORKERS: int = 8  # Threads for concurrent collection searches
+
+    # Response cache settings
+    # Reuse the answer of an identical earlier query of the same type
+    EXACT_CACHE_ENABLED: bool = (
+        os.getenv("EXACT_CACHE_ENABLED", "true").lower() == "true"
+    )
+    # Reuse the answer of a similar (not identical) earlier query of the same
+    # type. Opt-in: InstructorXL scores queries such as "move the left arm" and
+    # "move the right arm" very close, so a low threshold serves wrong answers
+    SEMANTIC_CACHE_ENABLED: bool = (
+        os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    )
+    # Min cosine similarity to reuse an answer
+    SEMANTIC_CACHE_THRESHOLD: float = float(
+        os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95")
+    )
+    CACHE_MAX_ENTRIES: int = 256
+    SEMANTIC_CACHE_SIZE: int = 512  # Ring buffer of embedded queries
+    EMBEDDING_CACHE_SIZE: int = 4096  # Query embeddings kept per process, ~3 KB each
 
     # Collection weights for different query types
     COLLECTION_WEIGHTS = {
@@ -107,6 +154,25 @@ class Config:
         # Debug mode
         self.debug: bool = os.getenv("DEBUG", "false").lower() == "true"
 
+        # Queries answered at once; more would only contend for the model
+        self.concurrency_limit: int = int(os.getenv("CONCURRENCY_LIMIT", "4"))
+        # Requests allowed to wait for a free slot; later ones are turned away
+        self.queue_max_size: int = int(os.getenv("QUEUE_MAX_SIZE", "64"))
+
+        # Example answer caching in the UI: "lazy" caches each example on its
+        # first click, "true" precomputes all of them at startup (one LLM call
+        # each), "false" only fills the query box. Gradio keeps cached answers
+        # on disk under GRADIO_EXAMPLES_CACHE (.gradio/cached_examples, or
+        # gradio_cached_examples before Gradio 5) and the Clear button does
+        # not reset them, so delete that directory after rebuilding the vector
+        # store or changing the prompts. Unrecognized values mean "false"
+        cache_examples = os.getenv("CACHE_EXAMPLES", "false").lower()
+        self.cache_examples: Union[bool, str] = {
+            "true": True,
+            "false": False,
+            "lazy": "lazy",
+        }.get(cache_examples, False)
+
     def validate(self) -> bool:
         """Validate the configuration."""
         if not self.model_config.MISTRAL_API_KEY:
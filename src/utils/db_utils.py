@@ -10,6 +10,8 @@ import chromadb
 import numpy as np
 from chromadb.config import Settings
 
+from .config import config
+
 
 @contextmanager
 def suppress_stdout():
@@ -50,9 +52,29 @@ Each chunk contains complete examples of using the vision system and cameras.
 Note: These examples demonstrate vision-specific functionality and camera integration.""",
     }
 
-    def __init__(self, persist_directory: str = "data/vectorstore"):
-        """Initialize the vector store with persistence."""
+    def __init__(self, persist_directory: str = "data/vectorstore", read_only: bool = False):
+        """Initialize the vector store with persistence.
+
+        With read_only=True an existing database is queried in place instead
+        of being copied to a temporary directory first. Chroma does not enforce
+        read-only access, so the database must not be rebuilt (tools/
+        update_vectordb.py) while a read-only store has it open.
+        """
         self.persist_directory = persist_directory
+        self.read_only = read_only and os.path.exists(persist_directory)
+        if read_only and not self.read_only:
+            print(
+                f"Warning: No database found at {persist_directory}, "
+                "using an empty temporary database"
+            )
+
+        # Queries never write, so open the saved database directly and let
+        # Chroma load its index files from there
+        if self.read_only:
+            self.temp_dir = None
+            self._initialize_client()
+            print(f"Opened existing database in place from {persist_directory}")
+            return
 
         # Create a temporary directory for the database
         self.temp_dir = tempfile.mkdtemp()
@@ -71,20 +93,28 @@ Note: These examples demonstrate vision-specific functionality and camera integr
 
     def _initialize_client(self):
         """Initialize the ChromaDB client with appropriate settings."""
+        # A store opened in place must never be able to wipe the saved database
         settings = chromadb.Settings(
-            anonymized_telemetry=False, allow_reset=True, is_persistent=True
+            anonymized_telemetry=False,
+            allow_reset=not self.read_only,
+            is_persistent=True,
         )
 
+        # Collection handles are tied to the client, so reset them with it
+        self._collections = {}
+
         try:
-            self.client = chromadb.PersistentClient(
-                path=self.temp_dir, settings=settings
-            )
+            path = self.persist_directory if self.read_only else self.temp_dir
+            self.client = chromadb.PersistentClient(path=path, settings=settings)
         except Exception as e:
             print(f"Error initializing ChromaDB client: {e}")
             raise
 
     def cleanup(self):
         """Clean up the vectorstore directory completely."""
+        if self.read_only:
+            raise RuntimeError("Cannot clean up a vector store opened read-only")
+
         print(f"Cleaning up vectorstore directory")
 
         try:
@@ -119,6 +149,9 @@ Note: These examples demonstrate vision-specific functionality and camera integr
 
     def save(self):
         """Save the current state to the persist directory."""
+        if self.read_only:
+            raise RuntimeError("Cannot save a vector store opened read-only")
+
         try:
             print("[DEBUG] Starting save operation...")
 
@@ -152,7 +185,7 @@ Note: These examples demonstrate vision-specific functionality and camera integr
         try:
             if hasattr(self, "client"):
                 del self.client
-            if hasattr(self, "temp_dir") and os.path.exists(self.temp_dir):
+            if getattr(self, "temp_dir", None) and os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir)
         except Exception:
             pass
@@ -178,14 +211,18 @@ Note: These examples demonstrate vision-specific functionality and camera integr
                 # Delete and recreate collection
                 self.client.delete_collection(name)
                 new_collection = self.client.create_collection(
-                    name=name, embedding_function=embedding_function
+                    name=name,
+                    embedding_function=embedding_function,
+                    metadata=config.rag_config.HNSW_SETTINGS,
                 )
                 return new_collection
 
         except chromadb.errors.InvalidCollectionException:
             # Collection doesn't exist, create new one
             return self.client.create_collection(
-                name=name, embedding_function=embedding_function
+                name=name,
+                embedding_function=embedding_function,
+                metadata=config.rag_config.HNSW_SETTINGS,
             )
 
     def add_documents(
@@ -201,7 +238,7 @@ Note: These examples demonstrate vision-specific functionality and camera integr
         collection = self.client.get_or_create_collection(
             name=collection_name,
             embedding_function=embedding_function,
-            metadata={"hnsw:space": "cosine"},
+            metadata=config.rag_config.HNSW_SETTINGS,
         )
 
         # Add collection-specific instruction to each text
@@ -209,11 +246,17 @@ Note: These examples demonstrate vision-specific functionality and camera integr
         if instruction:
             texts = [f"{instruction}:\n{text}" for text in texts]
 
-        # Process in batches of 100 documents
-        BATCH_SIZE = 100
+        # Embed everything up front so the encoder sees full batches and
+        # Chroma only has to index precomputed vectors
+        print(f"Embedding {len(texts)} documents...")
+        embeddings = embedding_function(texts)
+
+        # Insert in large batches; each add call updates the HNSW index once
+        BATCH_SIZE = 1000
         for i in range(0, len(texts), BATCH_SIZE):
             batch_end = min(i + BATCH_SIZE, len(texts))
             batch_texts = texts[i:batch_end]
+            batch_embeddings = embeddings[i:batch_end]
             batch_metadatas = metadatas[i:batch_end]
             batch_ids = ids[i:batch_end]
             
@@ -222,6 +265,7 @@ Note: These examples demonstrate vision-specific functionality and camera integr
                 # Add documents to collection
                 collection.add(
                     documents=batch_texts,
+                    embeddings=batch_embeddings,
                     metadatas=batch_metadatas,
                     ids=batch_ids
                 )
@@ -235,6 +279,7 @@ Note: These examples demonstrate vision-specific functionality and camera integr
                     try:
                         collection.add(
                             documents=texts[j:retry_end],
+                            embeddings=embeddings[j:retry_end],
                             metadatas=metadatas[j:retry_end],
                             ids=ids[j:retry_end]
                         )
@@ -242,27 +287,43 @@ Note: These examples demonstrate vision-specific functionality and camera integr
                         print(f"Error adding smaller batch: {str(e)}")
                         raise
 
+    def format_query(self, collection_name: str, text: str) -> str:
+        """Prefix a query with the collection's search instruction."""
+        instruction = self.COLLECTION_INSTRUCTIONS.get(collection_name, "")
+        if instruction:
+            return f"{instruction}\n\nQuery for relevant information from this source: {text}"
+        return text
+
     def query_collection(
         self,
         collection_name: str,
-        query_texts: List[str],
+        query_texts: Optional[List[str]] = None,
         n_results: int = 5,
         embedding_function: Callable = None,
+        query_embeddings: Optional[List[List[float]]] = None,
     ) -> Dict:
-        """Query a collection with collection-specific embedding instructions."""
-        collection = self.client.get_collection(
-            name=collection_name, embedding_function=embedding_function
-        )
-
-        # Add collection-specific instruction to query
-        instruction = self.COLLECTION_INSTRUCTIONS.get(collection_name, "")
-        if instruction:
-            query_texts = [
-                f"{instruction}\n\nQuery for relevant information from this source: {text}"
-                for text in query_texts
-            ]
+        """Query a collection with collection-specific embedding instructions.
+
+        Pass query_embeddings of already formatted queries to skip embedding.
+        """
+        # Resolve each collection once and reuse the handle for later queries
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = self.client.get_collection(
+                name=collection_name, embedding_function=embedding_function
+            )
+            self._collections[collection_name] = collection
 
         # Only include necessary data in the query
+        if query_embeddings is not None:
+            return collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                include=["documents", "distances"],
+            )
+
+        # Add collection-specific instruction to query
+        query_texts = [self.format_query(collection_name, text) for text in query_texts]
         return collection.query(
             query_texts=query_texts,
             n_results=n_results,
@@ -1,6 +1,8 @@
 import json
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
+import orjson
 from langchain.docstore.document import Document
 
 
@@ -46,8 +48,8 @@ def save_documents_to_json(documents: list, output_file: str):
                 continue
 
         # Save to file
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(doc_dicts, f, indent=2, ensure_ascii=False)
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(doc_dicts, option=orjson.OPT_INDENT_2))
 
     except Exception as e:
         print(f"Error saving documents to {output_file}: {str(e)}")
@@ -113,3 +115,16 @@ def prepare_documents_for_db(
         ids.append(doc_id)
 
     return texts, metadatas, ids
+
+
+def process_files_in_parallel(
+    process_file: Callable[[str], Optional[dict]], file_paths: List[str]
+) -> List[Optional[dict]]:
+    """Run process_file on each path in worker processes, keeping the path order.
+
+    process_file must be a module-level function so it can be pickled.
+    """
+    # Files are parsed independently, so spread them over all cores; map
+    # returns the results in input order
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(process_file, file_paths))
@@ -0,0 +1,85 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from .config import config
+
+
+class EmbeddingCache:
+    """LRU cache of text embeddings shared by everything in the process."""
+
+    def __init__(self, max_entries: int = 4096):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached embeddings, least recent evicted first.
+        """
+        self.max_entries = max_entries
+        # float32 arrays take 4 bytes per value, a list of floats about 32
+        self.entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Requests are served from several threads
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        """Build the cache key for a text."""
+        return hashlib.sha1(text.strip().encode()).digest()
+
+    def embed(
+        self, texts: List[str], embed_fn: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """Embed texts, encoding only those not cached yet in one embed_fn call.
+
+        Embeddings are returned as lists of floats, in the order of texts.
+        """
+        keys = [self._key(text) for text in texts]
+        found = {}
+        missing = {}
+        with self.lock:
+            for key, text in zip(keys, texts):
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    found[key] = self.entries[key]
+                elif key not in missing:
+                    missing[key] = text
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            embeddings = embed_fn(list(missing.values()))
+            found.update(
+                (key, np.asarray(embedding, dtype=np.float32))
+                for key, embedding in zip(missing, embeddings)
+            )
+            with self.lock:
+                for key in missing:
+                    self.entries[key] = found[key]
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+
+        return [found[key].tolist() for key in keys]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit and miss counts and the number of cached embeddings."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self.entries),
+            }
+
+    def clear(self):
+        """Remove all cached embeddings and reset the counters."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide cache used by every RAG pipeline
+embedding_cache = EmbeddingCache(config.rag_config.EMBEDDING_CACHE_SIZE)
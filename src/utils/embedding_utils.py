@@ -1,5 +1,6 @@
 import os
 import uuid
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
@@ -8,15 +9,91 @@ from chromadb.api.types import Documents, EmbeddingFunction
 from langchain.docstore.document import Document
 from sentence_transformers import SentenceTransformer
 
+from .config import config
+
 
 class ChromaEmbeddingFunction(EmbeddingFunction):
     """Wrapper class for sentence-transformers model to match ChromaDB's interface."""
 
-    def __init__(self, model: SentenceTransformer):
+    def __init__(self, model: SentenceTransformer, batch_size: int = 32):
         self.model = model
+        self.batch_size = batch_size
 
     def __call__(self, input: Documents) -> List[List[float]]:
-        return self.model.encode(input).tolist()
+        # encode() sorts inputs by length so each batch is padded only to its longest text
+        return self.model.encode(input, batch_size=self.batch_size).tolist()
+
+
+def get_device() -> str:
+    """Return the best available torch device for local models."""
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+@lru_cache(maxsize=1)
+def load_embedding_model(model_name: str) -> SentenceTransformer:
+    """Load and optimize a SentenceTransformer model, reusing it across callers.
+
+    Args:
+        model_name: Name of the model to load.
+    """
+    import torch
+
+    device = get_device()
+    backend = config.model_config.EMBEDDING_BACKEND
+    print(f"Initializing embedding model: {model_name} on device {device}")
+
+    # Loading is cached above, so this runs once per process
+    num_threads = config.model_config.TORCH_NUM_THREADS
+    if device == "cpu" and num_threads > 0:
+        print(f"Using {num_threads} torch threads for CPU inference")
+        torch.set_num_threads(num_threads)
+
+    # Exported graphs come pre-fused from ONNX Runtime/OpenVINO; the torch
+    # precision and compile options below don't apply to them.
+    if backend != "torch":
+        print(f"Using {backend} backend for embedding model")
+        return SentenceTransformer(model_name, device=device, backend=backend)
+
+    model = SentenceTransformer(model_name, device=device)
+
+    # BF16 halves weight bandwidth; FP16 is avoided as T5 encoders overflow in it
+    if (
+        device == "cuda"
+        and config.model_config.EMBEDDING_BF16
+        and torch.cuda.is_bf16_supported()
+    ):
+        print("Using BF16 weights for embedding model")
+        model.to(torch.bfloat16)
+
+    # Dynamic INT8 quantization halves the weight bytes read per forward pass
+    if device == "cpu" and config.model_config.EMBEDDING_QUANTIZE_INT8:
+        print("Quantizing embedding model linear layers to INT8")
+        torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+
+    # Fuse the encoder's kernels; compilation happens lazily on the first call.
+    # CUDA graphs only exist on CUDA; elsewhere compile for dynamic sequence
+    # lengths so each new padded batch length doesn't trigger a recompile.
+    if config.model_config.EMBEDDING_COMPILE:
+        print("Compiling embedding model with torch.compile")
+        transformer = model[0]
+        if device == "cuda":
+            transformer.auto_model = torch.compile(
+                transformer.auto_model, mode="reduce-overhead"
+            )
+        else:
+            transformer.auto_model = torch.compile(
+                transformer.auto_model, dynamic=True
+            )
+
+    return model
 
 
 class EmbeddingGenerator(EmbeddingFunction):
@@ -29,12 +106,13 @@ class EmbeddingGenerator(EmbeddingFunction):
             model_name: Name of the model to use. Defaults to InstructorXL.
         """
         self.model_name = model_name
-        import torch
+        self.model = load_embedding_model(model_name)
 
-        device = "mps" if torch.backends.mps.is_available() else "cpu"
-        print(f"Initializing embedding model: {model_name} on device {device}")
-        self.model = SentenceTransformer(model_name, device=device)
-        self.embedding_function = ChromaEmbeddingFunction(self.model)
+        # Larger batches keep a GPU busy; on CPU they only add padding work
+        batch_size = config.model_config.EMBEDDING_BATCH_SIZE
+        if batch_size <= 0:
+            batch_size = 64 if self.model.device.type == "cuda" else 16
+        self.embedding_function = ChromaEmbeddingFunction(self.model, batch_size)
 
     def __call__(self, input: Documents) -> List[List[float]]:
         instruction = "Represent this robotics documentation for retrieval:"
@@ -1,24 +1,38 @@
-import json
+from typing import List, Tuple
 
+import orjson
 from langchain.docstore.document import Document
 
 
+def read_notebook_cells(notebook_path: str) -> List[Tuple[str, str]]:
+    """Read the (cell type, source) pairs of a notebook.
+
+    The JSON is decoded directly since only the cell sources are needed, which
+    skips nbformat's validation and version upgrade.
+    """
+    with open(notebook_path, "rb") as f:
+        nb = orjson.loads(f.read())
+
+    cells = []
+    for cell in nb.get("cells", []):
+        source = cell.get("source", "")
+        if isinstance(source, list):
+            source = "".join(source)
+        cells.append((cell.get("cell_type"), source))
+    return cells
+
+
 def process_notebook(notebook_path, source_file):
     """
     Process a Jupyter notebook into meaningful chunks.
     Returns a list of Document objects.
     """
-    with open(notebook_path, "r", encoding="utf-8") as f:
-        nb = json.load(f)
-
     documents = []
     cell_number = 0
     current_section = "Start of Notebook"
 
-    for cell in nb["cells"]:
+    for cell_type, source in read_notebook_cells(notebook_path):
         cell_number += 1
-        cell_type = cell["cell_type"]
-        source = "".join(cell["source"])
 
         if cell_type == "markdown":
             # Update current section if this is a header
@@ -0,0 +1,136 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different phrasings share a cache key."""
+    return re.sub(r"\s+", " ", query.strip().lower()).rstrip(" ?!.")
+
+
+class RAGCache:
+    """Caches generated responses for exact repeats and semantically similar queries."""
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 256,
+        semantic_entries: int = 512,
+        semantic_enabled: bool = True,
+        exact_enabled: bool = True,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cached response to be reused.
+            max_entries: Maximum number of exact-match responses, least recent
+                evicted first.
+            semantic_entries: Size of the semantic ring buffer, oldest entries
+                overwritten first.
+            semantic_enabled: Whether similar queries may reuse a response; when
+                False only exact repeats are served.
+            exact_enabled: Whether identical queries may reuse a response.
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.semantic_entries = semantic_entries
+        self.semantic_enabled = semantic_enabled
+        self.exact_enabled = exact_enabled
+        # Exact tier: (normalized query, query type) -> response, in LRU order
+        self.exact: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        # Semantic tier: ring buffer, allocated once the embedding size is known
+        self.embeddings: Optional[np.ndarray] = None  # (capacity, D) unit vectors
+        self.responses: List[Optional[str]] = []
+        self.query_types: List[Optional[str]] = []
+        self.size = 0  # Filled slots
+        self.next_slot = 0  # Slot the next response overwrites
+        # Gradio serves several queries at once, each on its own thread
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str, query_type: str) -> Tuple[str, str]:
+        """Build the exact-match key for a query."""
+        return normalize_query(query), query_type
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        """Convert an embedding to a float32 unit vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def get_exact(self, query: str, query_type: str) -> Optional[str]:
+        """Return the cached response for the same query text, if any."""
+        if not self.exact_enabled:
+            return None
+
+        key = self._key(query, query_type)
+        with self.lock:
+            response = self.exact.get(key)
+            if response is not None:
+                self.exact.move_to_end(key)
+        return response
+
+    def get_similar(self, embedding, query_type: str) -> Optional[str]:
+        """Return the closest cached response of the same type, if similar enough."""
+        if not self.semantic_enabled:
+            return None
+
+        vector = self._normalize(embedding)
+        with self.lock:
+            if self.size == 0:
+                return None
+
+            # One matrix-vector product scores every cached query; answers to
+            # another query type were generated with other context, so skip them
+            similarities = self.embeddings[: self.size] @ vector
+            other_type = np.array(self.query_types[: self.size]) != query_type
+            similarities[other_type] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return self.responses[best]
+        return None
+
+    def put(self, query: str, query_type: str, embedding, response: str):
+        """Store a response in the enabled tiers, evicting the oldest entries if full.
+
+        The embedding may be None when the semantic tier is disabled.
+        """
+        key = self._key(query, query_type)
+        semantic = self.semantic_enabled and embedding is not None
+        vector = self._normalize(embedding) if semantic else None
+        with self.lock:
+            if self.exact_enabled:
+                self.exact[key] = response
+                self.exact.move_to_end(key)
+                if len(self.exact) > self.max_entries:
+                    self.exact.popitem(last=False)
+
+            if not semantic:
+                return
+
+            # Write into the preallocated ring instead of growing an array
+            if self.embeddings is None:
+                self.embeddings = np.empty(
+                    (self.semantic_entries, vector.shape[0]), dtype=np.float32
+                )
+                self.responses = [None] * self.semantic_entries
+                self.query_types = [None] * self.semantic_entries
+            self.embeddings[self.next_slot] = vector
+            self.responses[self.next_slot] = response
+            self.query_types[self.next_slot] = query_type
+            self.next_slot = (self.next_slot + 1) % self.semantic_entries
+            self.size = min(self.size + 1, self.semantic_entries)
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self.lock:
+            self.exact.clear()
+            self.embeddings = None
+            self.responses = []
+            self.query_types = []
+            self.size = 0
+            self.next_slot = 0
@@ -1,9 +1,17 @@
+import hashlib
+import heapq
+import json
 import logging
+import operator
 import os
 import shutil
 import tempfile
+import threading
 import time
-from typing import Any, Callable, Dict, List
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
 import chromadb
 import requests
@@ -11,7 +19,9 @@ from sentence_transformers import CrossEncoder
 
 from .config import config
 from .db_utils import VectorStore
-from .embedding_utils import EmbeddingGenerator
+from .embed_cache import embedding_cache
+from .embedding_utils import EmbeddingGenerator, get_device
+from .rag_cache import RAGCache, normalize_query
 
 # Configure logging to reduce verbosity
 logging.getLogger("chromadb").setLevel(logging.ERROR)
@@ -24,8 +34,12 @@ logger = logging.getLogger("reachy2_agent")
 
 def detect_query_type(query: str) -> str:
     """Detect the type of query based on keywords."""
-    query = query.lower()
+    return _detect_normalized_query_type(query.strip().lower())
 
+
+@lru_cache(maxsize=1024)
+def _detect_normalized_query_type(query: str) -> str:
+    """Keyword scan behind detect_query_type, cached per normalized query."""
     # Check each query type's keywords
     for query_type, keywords in config.rag_config.QUERY_KEYWORDS.items():
         if any(keyword in query for keyword in keywords):
@@ -37,6 +51,12 @@ def detect_query_type(query: str) -> str:
 class QueryDecomposer:
     """Handles breaking down complex queries into sub-queries."""
 
+    # Queries shorter than this with no chaining words are answered as-is
+    MIN_DECOMPOSE_WORDS = 10
+    CHAINING_MARKERS = (" and ", " then ", " also ", "; ", ", and")
+    # Decompositions kept per normalized query, least recent evicted first
+    MAX_CACHED_DECOMPOSITIONS = 1024
+
     def __init__(self):
         self.api_key = config.model_config.MISTRAL_API_KEY
         self.endpoint = config.model_config.QUERY_MODEL_ENDPOINT
@@ -45,9 +65,35 @@ class QueryDecomposer:
         self.max_tokens = config.model_config.QUERY_MAX_TOKENS
         print(f"Using {self.model} for query decomposition")
         self.debug = config.debug
+        # Keep-alive session so consecutive calls reuse the TLS connection
+        self.session = requests.Session()
+        # Repeated questions reuse their earlier decomposition
+        self.cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self.cache_lock = threading.Lock()
+
+    @classmethod
+    def needs_decomposition(cls, query: str) -> bool:
+        """Cheaply decide whether a query is complex enough to decompose."""
+        if len(query.split()) >= cls.MIN_DECOMPOSE_WORDS:
+            return True
+        lowered = query.lower()
+        return any(marker in lowered for marker in cls.CHAINING_MARKERS)
 
     def decompose_query(self, query: str) -> List[str]:
         """Break down a complex query into simpler sub-queries."""
+        # Short single-step queries come back unchanged; skip the LLM call
+        if not self.needs_decomposition(query):
+            if self.debug:
+                logger.info("⏭️ Skipping decomposition for simple query: %s", query)
+            return [query]
+
+        key = normalize_query(query)
+        with self.cache_lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                return list(cached)
+
         try:
             if self.debug:
                 logger.info("🤔 Decomposing query: %s", query)
@@ -115,7 +161,7 @@ IMPORTANT: Prefix each step of your reasoning with [REASON] so it can be logged.
                 "Content-Type": "application/json",
             }
 
-            response = requests.post(self.endpoint, json=payload, headers=headers)
+            response = self.session.post(self.endpoint, json=payload, headers=headers)
             response.raise_for_status()
             response_json = response.json()
 
@@ -126,7 +172,12 @@ IMPORTANT: Prefix each step of your reasoning with [REASON] so it can be logged.
                     if line.startswith("[REASON]"):
                         logger.info("🔍 %s", line.replace("[REASON] ", ""))
 
-            return self._parse_response(response_json)
+            sub_queries = self._parse_response(response_json)
+            with self.cache_lock:
+                self.cache[key] = tuple(sub_queries)
+                if len(self.cache) > self.MAX_CACHED_DECOMPOSITIONS:
+                    self.cache.popitem(last=False)
+            return sub_queries
 
         except requests.exceptions.RequestException as e:
             print(f"Error making request to Mistral API: {str(e)}")
@@ -187,7 +238,8 @@ class ReRanker:
     """Handles re-ranking of retrieved documents using a cross-encoder."""
 
     def __init__(self):
-        self.model = CrossEncoder(config.model_config.RERANK_MODEL)
+        device = get_device()
+        self.model = CrossEncoder(config.model_config.RERANK_MODEL, device=device)
         self.top_k = config.rag_config.RERANK_TOP_K
 
     def rerank(
@@ -304,6 +356,9 @@ Security:
         "default": "Provide a code-focused response with implementation details.",
     }
 
+    # Prefix of the message returned when generation fails
+    ERROR_PREFIX = "I apologize, but I encountered an error"
+
     # Maximum number of previous messages to include for context
     MAX_HISTORY_MESSAGES = 3  # Reduced from 5 to keep context more focused
 
@@ -358,7 +413,20 @@ Security:
         self.temperature = config.model_config.CODE_MODEL_TEMP
         self.max_tokens = config.model_config.CODE_MAX_TOKENS
         self.conversation_history = []
+        # process_query callers on several threads share the history above
+        self.history_lock = threading.Lock()
         self.debug = config.debug
+        # Keep-alive session so consecutive calls reuse the TLS connection
+        self.session = requests.Session()
+
+        # Build the static system prompt for each query type once
+        self.system_messages = {
+            query_type: {
+                "role": "system",
+                "content": f"{self.SYSTEM_PROMPT}\n{instructions}\n\nIMPORTANT: Prefix each step of your reasoning with [REASON] so it can be logged.",
+            }
+            for query_type, instructions in self.QUERY_TYPE_INSTRUCTIONS.items()
+        }
 
     def _format_message_for_history(self, role: str, content: str) -> dict:
         """Format a message for the conversation history."""
@@ -366,20 +434,18 @@ Security:
 
     def _get_relevant_history(self) -> List[dict]:
         """Get the most recent and relevant conversation history."""
-        return (
-            self.conversation_history[-self.MAX_HISTORY_MESSAGES :]
-            if self.conversation_history
-            else []
-        )
+        with self.history_lock:
+            return self.conversation_history[-self.MAX_HISTORY_MESSAGES :]
 
-    def _update_history(self, query: str, response: str):
+    def update_history(self, query: str, response: str):
         """Update the conversation history with new query and response."""
-        self.conversation_history.append(
-            self._format_message_for_history("user", query)
-        )
-        self.conversation_history.append(
-            self._format_message_for_history("assistant", response)
-        )
+        # Append the pair at once so concurrent turns cannot interleave
+        pair = [
+            self._format_message_for_history("user", query),
+            self._format_message_for_history("assistant", response),
+        ]
+        with self.history_lock:
+            self.conversation_history.extend(pair)
 
     def _check_safety_requirements(self, query: str, response: str) -> List[str]:
         """Check if the response needs safety guidelines based on content."""
@@ -429,59 +495,82 @@ Security:
         # Return response without appending guidelines
         return response
 
+    def _build_messages(
+        self,
+        query: str,
+        context: List[str],
+        query_type: str,
+        history: List[dict] = None,
+    ) -> List[dict]:
+        """Build the chat messages for a query, its context and recent history."""
+        # Format context
+        formatted_context = "\n\n".join(
+            f"Document {i+1}:\n{doc}" for i, doc in enumerate(context)
+        )
+
+        # Reuse the prebuilt system message for this query type
+        messages = [
+            self.system_messages.get(query_type, self.system_messages["default"])
+        ]
+
+        # Add relevant conversation history; a caller's own history replaces
+        # the shared one
+        if history is None:
+            history = self._get_relevant_history()
+        else:
+            history = history[-self.MAX_HISTORY_MESSAGES :]
+        if history and self.debug:
+            logger.info("📜 Using %d historical messages for context", len(history))
+
+        if history:
+            messages.extend(
+                [{"role": msg["role"], "content": msg["content"]} for msg in history]
+            )
+
+        # Add current query with context
+        messages.append(
+            {
+                "role": "user",
+                "content": f"""Query: {query}\n\nRelevant Documentation:\n{formatted_context}\n\nGenerate a detailed response that directly answers the query using the provided documentation and previous conversation context when relevant. Include relevant code examples when appropriate.""",
+            }
+        )
+        return messages
+
     def generate_response(
         self, query: str, context: List[str], query_type: str = "default"
     ) -> str:
         """Generate a response based on the query, context, and conversation history."""
+        return "".join(self.stream_response(query, context, query_type))
+
+    def stream_response(
+        self,
+        query: str,
+        context: List[str],
+        query_type: str = "default",
+        history: List[dict] = None,
+    ) -> Iterator[str]:
+        """Generate a response like generate_response, yielding text as it arrives.
+
+        The conversation history is updated once the full response is known.
+        Pass history, the earlier {"role", "content"} messages of the caller's
+        own conversation, to answer within it instead; the shared history is
+        then neither sent nor updated. Failures are reported in-band as a
+        message containing ERROR_PREFIX.
+        """
+        generated_response = ""
         try:
             if self.debug:
                 logger.info("💭 Generating response for: %s", query)
                 logger.info("📚 Using %d context documents", len(context))
 
-            # Get type-specific instructions
-            type_instructions = self.QUERY_TYPE_INSTRUCTIONS.get(
-                query_type, self.QUERY_TYPE_INSTRUCTIONS["default"]
-            )
-
-            # Format context
-            formatted_context = "\n\n".join(
-                f"Document {i+1}:\n{doc}" for i, doc in enumerate(context)
-            )
-
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"{self.SYSTEM_PROMPT}\n{type_instructions}\n\nIMPORTANT: Prefix each step of your reasoning with [REASON] so it can be logged.",
-                }
-            ]
-
-            # Add relevant conversation history
-            history = self._get_relevant_history()
-            if history and self.debug:
-                logger.info("📜 Using %d historical messages for context", len(history))
-
-            if history:
-                messages.extend(
-                    [
-                        {"role": msg["role"], "content": msg["content"]}
-                        for msg in history
-                    ]
-                )
-
-            # Add current query with context
-            messages.append(
-                {
-                    "role": "user",
-                    "content": f"""Query: {query}\n\nRelevant Documentation:\n{formatted_context}\n\nGenerate a detailed response that directly answers the query using the provided documentation and previous conversation context when relevant. Include relevant code examples when appropriate.""",
-                }
-            )
+            messages = self._build_messages(query, context, query_type, history)
 
             if self.debug:
                 logger.info("📤 Sending request to model...")
 
             headers = {
                 "Content-Type": "application/json",
-                "Accept": "application/json",
+                "Accept": "text/event-stream",
                 "Authorization": f"Bearer {self.api_key}",
             }
 
@@ -490,13 +579,26 @@ Security:
                 "messages": messages,
                 "temperature": self.temperature,
                 "max_tokens": self.max_tokens,
+                "stream": True,
             }
 
-            response = requests.post(self.endpoint, headers=headers, json=data)
-            response.raise_for_status()
-
-            result = response.json()
-            generated_response = result["choices"][0]["message"]["content"]
+            # The API streams server-sent events, one JSON delta per data line.
+            # Lines stay bytes: requests would decode an event stream without a
+            # charset as ISO-8859-1, while json.loads decodes bytes as UTF-8
+            with self.session.post(
+                self.endpoint, headers=headers, json=data, stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    payload = line[len(b"data: ") :]
+                    if payload == b"[DONE]":
+                        break
+                    delta = json.loads(payload)["choices"][0]["delta"].get("content")
+                    if delta:
+                        generated_response += delta
+                        yield delta
 
             # Extract and log reasoning steps
             if self.debug:
@@ -511,21 +613,23 @@ Security:
             final_response = self._append_safety_guidelines(
                 generated_response, required_guidelines
             )
+            if len(final_response) > len(generated_response):
+                yield final_response[len(generated_response) :]
 
             # Update conversation history
-            self._update_history(query, final_response)
+            if history is None:
+                self.update_history(query, final_response)
 
             if self.debug:
                 logger.info("✅ Response generation complete")
 
-            return final_response
-
         except Exception as e:
-            error_msg = f"I apologize, but I encountered an error while generating the response: {str(e)}"
+            error_msg = f"{self.ERROR_PREFIX} while generating the response: {str(e)}"
             if self.debug:
                 logger.error("❌ Error generating response: %s", str(e))
-            self._update_history(query, error_msg)
-            return error_msg
+            if history is None:
+                self.update_history(query, error_msg)
+            yield f"\n\n{error_msg}" if generated_response else error_msg
 
 
 class RAGPipeline:
@@ -536,58 +640,274 @@ class RAGPipeline:
         self.decomposer = QueryDecomposer()
         self.embedding_generator = EmbeddingGenerator(model_name="hkunlp/instructor-xl")
         print("Using InstructorXL for embeddings")
-        self.vector_store = VectorStore()
-        self.reranker = ReRanker()
+        self.vector_store = VectorStore(read_only=True)
+        self._reranker = None
         self.generator = ResponseGenerator()
+        self.response_cache = RAGCache(
+            threshold=config.rag_config.SEMANTIC_CACHE_THRESHOLD,
+            max_entries=config.rag_config.CACHE_MAX_ENTRIES,
+            semantic_entries=config.rag_config.SEMANTIC_CACHE_SIZE,
+            semantic_enabled=config.rag_config.SEMANTIC_CACHE_ENABLED,
+            exact_enabled=config.rag_config.EXACT_CACHE_ENABLED,
+        )
+
+    def warmup(self):
+        """Run the embedding model and load every collection's index once.
+
+        The first real query then runs at warm latency instead of paying for
+        lazy model initialization and index loading.
+        """
+        start = time.time()
+        collections = self.configured_collections()
+        query_embeddings = self.embed_queries(collections, ["warm up"])
+        for collection in collections:
+            self.vector_store.query_collection(
+                collection_name=collection,
+                n_results=1,
+                embedding_function=self.embedding_generator,
+                query_embeddings=query_embeddings[collection],
+            )
+        print(f"Warmed up {len(collections)} collections in {time.time() - start:.2f}s")
+
+    def prewarm_queries(self, queries: List[str]):
+        """Embed known queries in one batch to fill the embedding cache.
+
+        The plain query embeddings are only used by the semantic response
+        cache, so they are skipped while that tier is disabled.
+        """
+        start = time.time()
+        texts = [
+            self.vector_store.format_query(collection, query)
+            for collection in self.configured_collections()
+            for query in queries
+        ]
+        if self.response_cache.semantic_enabled:
+            texts += queries
+        embedding_cache.embed(texts, self.embedding_generator)
+        print(f"Pre-encoded {len(queries)} queries in {time.time() - start:.2f}s")
+
+    @staticmethod
+    def configured_collections() -> List[str]:
+        """List every collection used by any query type, in configured order."""
+        return list(
+            dict.fromkeys(
+                collection
+                for weights in config.rag_config.COLLECTION_WEIGHTS.values()
+                for collection in weights
+            )
+        )
 
-    def get_collection_weights(self, query: str) -> dict:
+    @property
+    def reranker(self) -> ReRanker:
+        """Cross-encoder re-ranker, loaded on first use rather than at startup."""
+        if self._reranker is None:
+            self._reranker = ReRanker()
+        return self._reranker
+
+    def get_collection_weights(self, query: str, query_type: str = None) -> dict:
         """Get collection weights based on query type."""
-        query_type = detect_query_type(query)
+        query_type = query_type or detect_query_type(query)
+        return self.weights_for_query_type(query_type)
+
+    @staticmethod
+    def weights_for_query_type(query_type: str) -> dict:
+        """Get the weights of the collections searched for a query type."""
         return config.rag_config.COLLECTION_WEIGHTS[query_type]
 
-    def process_query(self, query: str) -> str:
-        """Process a query through the complete RAG pipeline."""
+    def embed_queries(
+        self, collections: List[str], queries: List[str]
+    ) -> Dict[str, List[List[float]]]:
+        """Embed each query with every collection's instruction in one model call.
+
+        Returns the query embeddings per collection, in query order.
+        """
+        texts = [
+            self.vector_store.format_query(collection, query)
+            for collection in collections
+            for query in queries
+        ]
+        embeddings = embedding_cache.embed(texts, self.embedding_generator)
+
+        n = len(queries)
+        return {
+            collection: embeddings[i * n : (i + 1) * n]
+            for i, collection in enumerate(collections)
+        }
+
+    def search_collection(
+        self,
+        collection: str,
+        query: str,
+        weight: float,
+        label: str = None,
+        query_embedding: List[float] = None,
+    ) -> List[Tuple[str, float]]:
+        """Search a single collection and return (document, weighted distance) pairs."""
+        query_embeddings = [query_embedding] if query_embedding is not None else None
+        return self.search_collection_batch(
+            collection, [query], weight, label, query_embeddings
+        )[0]
+
+    def search_collection_batch(
+        self,
+        collection: str,
+        queries: List[str],
+        weight: float,
+        label: str = None,
+        query_embeddings: List[List[float]] = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """Search a collection for several queries with one batched embedding and search call."""
+        results = self.vector_store.query_collection(
+            collection_name=collection,
+            query_texts=queries,
+            n_results=config.rag_config.TOP_K_CHUNKS,
+            embedding_function=self.embedding_generator,
+            query_embeddings=query_embeddings,
+        )
+
+        # Tag each document with its source and weight its distance
+        label = label or collection
+        return [
+            [(f"[{label}] {doc}", dist * weight) for doc, dist in zip(docs, dists)]
+            for docs, dists in zip(results["documents"], results["distances"])
+        ]
+
+    @staticmethod
+    def _document_key(document: str) -> bytes:
+        """Hash a tagged document's text without its source label and instruction."""
+        body = document.split("] ", 1)[1] if document.startswith("[") else document
+        for instruction in VectorStore.COLLECTION_INSTRUCTIONS.values():
+            if body.startswith(instruction):
+                body = body[len(instruction) :]
+                break
+        return hashlib.blake2b(body.encode(), digest_size=8).digest()
+
+    def select_top_documents(self, results: List[Tuple[str, float]]) -> List[str]:
+        """Select the documents with the lowest weighted distances.
+
+        A document found in several collections is kept once, with its best score.
+        """
+        best = {}
+        for doc, score in results:
+            key = self._document_key(doc)
+            if key not in best or score < best[key][1]:
+                best[key] = (doc, score)
+
+        # Partial heap selection; ties keep their input order like a stable sort
+        top = heapq.nsmallest(
+            config.rag_config.TOP_K_CHUNKS, best.values(), key=operator.itemgetter(1)
+        )
+        return [doc for doc, _ in top]
+
+    def retrieve(self, query: str, query_type: str = None) -> List[str]:
+        """Retrieve the most relevant documents for a query across all collections."""
+        query_type = query_type or detect_query_type(query)
+        return self.retrieve_batch([query], query_type)[0]
+
+    def retrieve_batch(
+        self, queries: List[str], query_type: str = "default"
+    ) -> List[List[str]]:
+        """Retrieve the most relevant documents for several queries at once.
+
+        All queries are embedded for all collections in a single batch, then
+        each collection is searched once for all queries.
+        """
+        collection_weights = self.weights_for_query_type(query_type)
+        query_embeddings = self.embed_queries(list(collection_weights), queries)
+
+        all_results = [[] for _ in queries]
+        for collection, weight in collection_weights.items():
+            batch_results = self.search_collection_batch(
+                collection,
+                queries,
+                weight,
+                query_embeddings=query_embeddings[collection],
+            )
+            for query_results, results in zip(all_results, batch_results):
+                query_results.extend(results)
+
+        return [self.select_top_documents(results) for results in all_results]
+
+    def retrieve_sub_queries(
+        self, sub_queries: List[str], query_type: str = "default"
+    ) -> List[str]:
+        """Retrieve documents for the sub-queries of a decomposed query.
+
+        All sub-queries are retrieved in one batch, then their results are
+        interleaved by rank and deduplicated, up to TOP_K_CHUNKS documents.
+        """
+        seen = set()
+        selected = []
+        for docs in zip_longest(*self.retrieve_batch(sub_queries, query_type)):
+            for doc in docs:
+                if doc is None:
+                    continue
+                key = self._document_key(doc)
+                if key not in seen:
+                    seen.add(key)
+                    selected.append(doc)
+        return selected[: config.rag_config.TOP_K_CHUNKS]
+
+    def lookup_cache(self, query: str, query_type: str) -> Tuple[Any, Any]:
+        """Look up a cached response, trying the exact tier before the semantic one.
+
+        Returns the cached response (or None) and the query embedding, which is
+        None on an exact hit or with the semantic tier disabled since no
+        embedding was needed.
+        """
+        cached_response = self.response_cache.get_exact(query, query_type)
+        if cached_response is not None or not self.response_cache.semantic_enabled:
+            return cached_response, None
+
+        query_embedding = embedding_cache.embed([query], self.embedding_generator)[0]
+        cached_response = self.response_cache.get_similar(query_embedding, query_type)
+        return cached_response, query_embedding
+
+    def process_query(self, query: str, sub_queries: List[str] = None) -> str:
+        """Process a query through the complete RAG pipeline.
+
+        Pass the sub-queries of an already decomposed query to retrieve
+        documents for each of them instead of for the query as a whole.
+        """
+        return "".join(self.process_query_stream(query, sub_queries))
+
+    def process_query_stream(
+        self, query: str, sub_queries: List[str] = None
+    ) -> Iterator[str]:
+        """Process a query through the RAG pipeline, yielding response chunks."""
         try:
             # 1. Get query type for context-aware processing
             query_type = detect_query_type(query)
 
-            # 2. Get collection weights for this query
-            collection_weights = self.get_collection_weights(query)
-
-            # 3. Retrieve relevant documents from each collection
-            all_results = []
-            for collection, weight in collection_weights.items():
-                results = self.vector_store.query_collection(
-                    collection_name=collection,
-                    query_texts=[query],
-                    n_results=config.rag_config.TOP_K_CHUNKS,
-                    embedding_function=self.embedding_generator,
-                )
-
-                # Weight the results based on collection
-                documents = results["documents"][0]
-                distances = results["distances"][0]
-
-                # Add source collection to metadata
-                documents_with_source = [f"[{collection}] {doc}" for doc in documents]
-
-                # Store results with their weighted scores
-                for doc, dist in zip(documents_with_source, distances):
-                    all_results.append((doc, dist * weight))
-
-            # 4. Sort and select top results
-            all_results.sort(key=lambda x: x[1])
-            selected_docs = [
-                doc for doc, _ in all_results[: config.rag_config.TOP_K_CHUNKS]
-            ]
+            # 2. Reuse the answer of an identical or near-identical earlier
+            # query. Answers depend on the conversation so far, so only turns
+            # without history read or fill the cache
+            use_cache = not self.generator._get_relevant_history()
+            cached_response, query_embedding = None, None
+            if use_cache:
+                cached_response, query_embedding = self.lookup_cache(query, query_type)
+            if cached_response is not None:
+                self.generator.update_history(query, cached_response)
+                yield cached_response
+                return
+
+            # 3. Retrieve the most relevant documents across collections
+            if sub_queries:
+                selected_docs = self.retrieve_sub_queries(sub_queries, query_type)
+            else:
+                selected_docs = self.retrieve(query, query_type)
 
-            # 5. Generate the final response
-            response = self.generator.generate_response(
+            # 4. Stream the final response from a single model call
+            response = ""
+            for delta in self.generator.stream_response(
                 query=query, context=selected_docs, query_type=query_type
-            )
+            ):
+                response += delta
+                yield delta
 
-            return response
+            if use_cache and ResponseGenerator.ERROR_PREFIX not in response:
+                self.response_cache.put(query, query_type, query_embedding, response)
 
         except Exception as e:
             print(f"Error processing query: {str(e)}")
-            return f"I apologize, but I encountered an error while processing your query: {str(e)}"
+            yield f"I apologize, but I encountered an error while processing your query: {str(e)}"
@@ -3,6 +3,7 @@
 import json
 import os
 import sys
+from itertools import chain
 from pprint import pprint
 
 # Add parent directory to path
@@ -30,7 +31,7 @@ def analyze_chunks(filepath: str, max_display: int = 3):
     print(f"\nAnalyzing chunks from: {filepath}")
     print("=" * 80)
 
-    with open(filepath, "r") as f:
+    with open(filepath, "r", encoding="utf-8") as f:
         chunks = json.load(f)
 
     print(f"\nTotal chunks: {len(chunks)}")
@@ -47,7 +48,8 @@ def analyze_chunks(filepath: str, max_display: int = 3):
     # Display metadata keys
     if chunks:
         print("\nMetadata keys present:")
-        print(set().union(*[set(chunk.get("metadata", {}).keys()) for chunk in chunks]))
+        metadata = (chunk.get("metadata", {}) for chunk in chunks)
+        print(set(chain.from_iterable(metadata)))
 
     # Display sample chunks
     print(f"\nDisplaying first {max_display} chunks as samples:")
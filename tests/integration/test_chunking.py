@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 import pytest
@@ -5,7 +6,8 @@ import pytest
 # Add the project root to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from tools.chunk_documents import clean_text, split_text
+from tools import chunk_documents
+from tools.chunk_documents import clean_text, dedupe_chunks, split_text
 
 
 def main():
@@ -57,5 +59,80 @@ def test_split_text():
     assert all(len(chunk) <= 20 for chunk in chunks)
 
 
+def test_split_text_stops_at_end():
+    """The last chunk is not followed by shorter copies of its tail."""
+    text = " ".join(f"word{i}" for i in range(400))
+    chunks = split_text(text, max_chunk_size=500, overlap_size=100)
+
+    assert chunks[-1].endswith("word399")
+    assert sum(chunk.endswith("word399") for chunk in chunks) == 1
+    assert len(chunks) == len(set(chunks))
+
+
+def test_dedupe_renumbers_chunks():
+    """Dropping duplicates keeps chunk indices and totals contiguous."""
+    def chunk(content, **metadata):
+        return {'content': content, 'metadata': metadata}
+
+    chunks = dedupe_chunks([
+        chunk("a", source="m.f", chunk_index=0, total_chunks=3),
+        chunk("b", source="m.f", chunk_index=1, total_chunks=3),
+        chunk("a", source="m.f", chunk_index=2, total_chunks=3),
+        chunk("c", source="m.g", chunk_index=0, total_chunks=1),
+    ])
+    assert [c['content'] for c in chunks] == ["a", "b", "c"]
+    assert [c['metadata']['chunk_index'] for c in chunks] == [0, 1, 0]
+    assert [c['metadata']['total_chunks'] for c in chunks] == [2, 2, 1]
+
+    chunks = dedupe_chunks([
+        chunk("x", chunk_index=0),
+        chunk("x", chunk_index=1),
+        chunk("y", chunk_index=2),
+    ])
+    assert [c['metadata']['chunk_index'] for c in chunks] == [0, 1]
+
+    # Parts of two split code blocks; part 2 of the second repeats the first's
+    chunks = dedupe_chunks([
+        chunk("p1", chunk_index=0, code_part=1, total_parts=3),
+        chunk("p2", chunk_index=1, code_part=2, total_parts=3),
+        chunk("p3", chunk_index=2, code_part=3, total_parts=3),
+        chunk("q1", chunk_index=3, code_part=1, total_parts=3),
+        chunk("p2", chunk_index=4, code_part=2, total_parts=3),
+        chunk("q3", chunk_index=5, code_part=3, total_parts=3),
+    ])
+    assert [c['metadata']['code_part'] for c in chunks] == [1, 2, 3, 1, 2]
+    assert [c['metadata']['total_parts'] for c in chunks] == [3, 3, 3, 2, 2]
+
+
+def test_second_run_skips_unchanged_sources(tmp_path, monkeypatch, capsys):
+    """Unchanged raw files are skipped even after a failed run cleaned up."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["chunk_documents.py"])
+    raw_dir = tmp_path / chunk_documents.RAW_DOCS_DIR
+    raw_dir.mkdir(parents=True)
+    (raw_dir / "raw_tutorials.json").write_text(json.dumps([
+        {"content": "Some tutorial text.", "metadata": {"source": "t.ipynb"}}
+    ]))
+    output = tmp_path / chunk_documents.OUTPUT_DIR / "reachy2_tutorials.json"
+
+    chunk_documents.main()
+    assert "Saved 1 chunks" in capsys.readouterr().out
+    saved_at = output.stat().st_mtime_ns
+
+    # A broken raw file makes the next run fail after its cleanup
+    broken = raw_dir / "raw_sdk_examples.json"
+    broken.write_text("{")
+    with pytest.raises(Exception):
+        chunk_documents.main()
+    broken.unlink()
+    capsys.readouterr()
+
+    chunk_documents.main()
+    last_run = capsys.readouterr().out
+    assert "Unchanged since the last run" in last_run
+    assert "Saved" not in last_run
+    assert output.stat().st_mtime_ns == saved_at
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
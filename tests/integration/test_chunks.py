@@ -1,14 +1,21 @@
-import json
+import io
 import os
-from typing import Dict, List
+from collections import defaultdict
+from contextlib import redirect_stdout
+from itertools import chain
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+
+import numpy as np
+import orjson
 
 
 def load_json_file(filepath: str) -> List[Dict]:
     if not os.path.exists(filepath):
         print(f"File not found: {filepath}")
         return []
-    with open(filepath, "r") as f:
-        return json.load(f)
+    with open(filepath, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def analyze_chunks(filepath: str, collection_name: str):
@@ -26,17 +33,22 @@ def analyze_chunks(filepath: str, collection_name: str):
     print(f"Total chunks: {total_chunks}")
 
     # Character count statistics
-    sizes = [len(chunk.get("content", "")) for chunk in chunks]
-    avg_size = sum(sizes) / len(sizes)
-    median_size = sorted(sizes)[len(sizes) // 2]
-    std_dev = (sum((x - avg_size) ** 2 for x in sizes) / len(sizes)) ** 0.5
+    contents = [chunk.get("content", "") for chunk in chunks]
+    sizes = np.fromiter(
+        map(len, contents),
+        dtype=np.int64,
+        count=total_chunks,
+    )
+    avg_size = sizes.sum() / total_chunks
+    median_size = np.partition(sizes, total_chunks // 2)[total_chunks // 2]
+    std_dev = sizes.std()
 
     print(f"Character count statistics:")
     print(f"- Average size: {avg_size:.2f} characters")
     print(f"- Median size: {median_size} characters")
     print(f"- Standard deviation: {std_dev:.2f} characters")
-    print(f"- Smallest chunk: {min(sizes)} characters")
-    print(f"- Largest chunk: {max(sizes)} characters")
+    print(f"- Smallest chunk: {sizes.min()} characters")
+    print(f"- Largest chunk: {sizes.max()} characters")
 
     # Size distribution
     size_ranges = [
@@ -46,9 +58,11 @@ def analyze_chunks(filepath: str, collection_name: str):
         (1501, 2000),
         (2001, float("inf")),
     ]
+    # Range starts are the bin edges: every [start, next_start) is one bucket
+    edges = [start for start, _ in size_ranges] + [np.inf]
+    counts, _ = np.histogram(sizes, bins=edges)
     print("\nSize distribution:")
-    for start, end in size_ranges:
-        count = sum(1 for size in sizes if start <= size <= end)
+    for (start, end), count in zip(size_ranges, counts):
         percentage = (count / total_chunks) * 100
         print(
             f"- {start}-{end if end != float('inf') else '+'} chars: {count} chunks ({percentage:.1f}%)"
@@ -59,16 +73,20 @@ def analyze_chunks(filepath: str, collection_name: str):
     print("-" * 40)
 
     # Collect all unique metadata keys
-    metadata_keys = set()
-    for chunk in chunks:
-        metadata_keys.update(chunk.keys())
+    metadata_keys = set(chain.from_iterable(chunk.keys() for chunk in chunks))
     metadata_keys.discard("content")  # Remove content as it's not metadata
 
     print("Metadata keys present:", metadata_keys)
 
+    # Gather every key's values in a single pass over the chunks
+    values_by_key = defaultdict(list)
+    for chunk in chunks:
+        for key, value in chunk.items():
+            values_by_key[key].append(value)
+
     # Analyze values for each metadata key
     for key in metadata_keys:
-        values = [chunk.get(key) for chunk in chunks if key in chunk]
+        values = values_by_key[key]
         unique_values = set(str(v) for v in values if v is not None)
         print(f"\n{key} analysis:")
         print(f"- Present in {len(values)} chunks")
@@ -79,8 +97,8 @@ def analyze_chunks(filepath: str, collection_name: str):
     # Content type analysis
     print("\nContent Analysis:")
     print("-" * 40)
-    code_chunks = sum(1 for chunk in chunks if "```python" in chunk.get("content", ""))
-    markdown_chunks = sum(1 for chunk in chunks if "###" in chunk.get("content", ""))
+    code_chunks = sum("```python" in content for content in contents)
+    markdown_chunks = sum("###" in content for content in contents)
     print(
         f"Chunks with code blocks: {code_chunks} ({(code_chunks/total_chunks)*100:.1f}%)"
     )
@@ -105,6 +123,15 @@ def analyze_chunks(filepath: str, collection_name: str):
         print()
 
 
+def _analyze_collection(item: Tuple[str, str]) -> str:
+    """Analyze one collection in a worker process and return its report."""
+    name, filepath = item
+    report = io.StringIO()
+    with redirect_stdout(report):
+        analyze_chunks(filepath, name)
+    return report.getvalue()
+
+
 def main():
     collections = {
         "API Classes": "data/external_docs/documents/api_docs_classes.json",
@@ -114,8 +141,14 @@ def main():
         "Tutorials": "data/external_docs/documents/reachy2_tutorials.json",
     }
 
-    for name, filepath in collections.items():
-        analyze_chunks(filepath, name)
+    # Collections are independent, so load and analyze them in parallel and
+    # print the reports in their original order
+    items = list(collections.items())
+    with Pool(min(len(items), os.cpu_count() or 1)) as pool:
+        reports = pool.map(_analyze_collection, items)
+
+    for report in reports:
+        print(report, end="")
 
 
 if __name__ == "__main__":
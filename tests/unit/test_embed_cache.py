@@ -0,0 +1,84 @@
+import os
+import sys
+
+import numpy as np
+
+# Ensure the parent directory is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.embed_cache import EmbeddingCache
+
+
+class CountingEmbedder:
+    """Fake embedding function recording the texts it is asked to encode."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_misses_embedded_in_one_call():
+    """Uncached texts are encoded together and returned in input order."""
+    cache = EmbeddingCache()
+    embed = CountingEmbedder()
+
+    assert cache.embed(["ab", "abc"], embed) == [[2.0, 1.0], [3.0, 1.0]]
+    assert embed.calls == [["ab", "abc"]]
+    assert cache.stats() == {"hits": 0, "misses": 2, "entries": 2}
+
+
+def test_hits_skip_the_embedder():
+    """Cached texts, including whitespace variants, are not encoded again."""
+    cache = EmbeddingCache()
+    embed = CountingEmbedder()
+    cache.embed(["ab"], embed)
+
+    assert cache.embed([" ab ", "abcd"], embed) == [[2.0, 1.0], [4.0, 1.0]]
+    assert embed.calls == [["ab"], ["abcd"]]
+    assert cache.stats()["hits"] == 1
+
+
+def test_duplicates_embedded_once():
+    """A text repeated within one call is encoded once."""
+    cache = EmbeddingCache()
+    embed = CountingEmbedder()
+
+    assert cache.embed(["ab", "ab"], embed) == [[2.0, 1.0], [2.0, 1.0]]
+    assert embed.calls == [["ab"]]
+
+
+def test_eviction():
+    """The least recently used embedding is evicted first."""
+    cache = EmbeddingCache(max_entries=2)
+    embed = CountingEmbedder()
+    cache.embed(["a", "bb"], embed)
+    cache.embed(["a"], embed)
+    cache.embed(["ccc"], embed)
+
+    cache.embed(["a", "bb"], embed)
+    assert embed.calls[-1] == ["bb"]
+
+
+def test_clear():
+    """Clearing removes the embeddings and resets the counters."""
+    cache = EmbeddingCache()
+    embed = CountingEmbedder()
+    cache.embed(["a"], embed)
+    cache.clear()
+
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0}
+    cache.embed(["a"], embed)
+    assert len(embed.calls) == 2
+
+
+def test_entries_stored_as_float32():
+    """Embeddings are kept as compact float32 arrays but returned as lists."""
+    cache = EmbeddingCache()
+    [embedding] = cache.embed(["ab"], CountingEmbedder())
+
+    assert isinstance(embedding, list)
+    [stored] = cache.entries.values()
+    assert stored.dtype == np.float32
@@ -0,0 +1,99 @@
+import os
+import sys
+
+# Ensure the parent directory is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.rag_cache import RAGCache, normalize_query
+
+
+def test_normalize_query():
+    """Case, surrounding whitespace and trailing punctuation are ignored."""
+    assert normalize_query("  How to MOVE   the arm? ") == "how to move the arm"
+
+
+def test_exact_hit():
+    """An identical query of the same type is served from the exact tier."""
+    cache = RAGCache()
+    cache.put("Move the arm", "code", [1.0, 0.0], "answer")
+
+    assert cache.get_exact("move the arm?", "code") == "answer"
+    assert cache.get_exact("move the arm", "default") is None
+    assert cache.get_exact("move the head", "code") is None
+
+
+def test_semantic_hit_and_miss():
+    """Only embeddings above the threshold and of the same query type hit."""
+    cache = RAGCache(threshold=0.95)
+    cache.put("move the left arm", "code", [1.0, 0.0], "left")
+
+    assert cache.get_similar([0.99, 0.05], "code") == "left"
+    assert cache.get_similar([0.99, 0.05], "default") is None
+    assert cache.get_similar([0.0, 1.0], "code") is None
+
+
+def test_semantic_picks_closest():
+    """The most similar cached query wins when several pass the threshold."""
+    cache = RAGCache(threshold=0.9)
+    cache.put("a", "code", [1.0, 0.0], "first")
+    cache.put("b", "code", [0.95, 0.3], "second")
+
+    assert cache.get_similar([0.94, 0.32], "code") == "second"
+
+
+def test_semantic_disabled():
+    """With the semantic tier off only exact repeats are served."""
+    cache = RAGCache(semantic_enabled=False)
+    cache.put("move the arm", "code", None, "answer")
+
+    assert cache.get_exact("move the arm", "code") == "answer"
+    assert cache.get_similar([1.0, 0.0], "code") is None
+    assert cache.size == 0
+
+
+def test_exact_disabled():
+    """With the exact tier off identical queries are not served or stored."""
+    cache = RAGCache(exact_enabled=False)
+    cache.put("move the arm", "code", [1.0, 0.0], "answer")
+
+    assert cache.get_exact("move the arm", "code") is None
+    assert not cache.exact
+    assert cache.get_similar([1.0, 0.0], "code") == "answer"
+
+
+def test_exact_eviction():
+    """The least recently used exact entry is evicted first."""
+    cache = RAGCache(max_entries=2)
+    cache.put("a", "code", [1.0, 0.0], "A")
+    cache.put("b", "code", [0.0, 1.0], "B")
+    cache.get_exact("a", "code")
+    cache.put("c", "code", [1.0, 1.0], "C")
+
+    assert cache.get_exact("a", "code") == "A"
+    assert cache.get_exact("b", "code") is None
+    assert cache.get_exact("c", "code") == "C"
+
+
+def test_semantic_ring_overwrites_oldest():
+    """A full ring buffer overwrites its oldest entry."""
+    cache = RAGCache(semantic_entries=2)
+    cache.put("a", "code", [1.0, 0.0, 0.0], "A")
+    cache.put("b", "code", [0.0, 1.0, 0.0], "B")
+    cache.put("c", "code", [0.0, 0.0, 1.0], "C")
+
+    assert cache.size == 2
+    assert cache.get_similar([1.0, 0.0, 0.0], "code") is None
+    assert cache.get_similar([0.0, 1.0, 0.0], "code") == "B"
+    assert cache.get_similar([0.0, 0.0, 1.0], "code") == "C"
+
+
+def test_clear():
+    """Clearing empties both tiers."""
+    cache = RAGCache()
+    cache.put("a", "code", [1.0, 0.0], "A")
+    cache.clear()
+
+    assert cache.get_exact("a", "code") is None
+    assert cache.get_similar([1.0, 0.0], "code") is None
+    cache.put("b", "code", [0.0, 1.0, 0.0], "B")
+    assert cache.get_similar([0.0, 1.0, 0.0], "code") == "B"
@@ -44,11 +44,11 @@ def test_pipeline(pipeline: RAGPipeline, query: str):
             for i, sub_query in enumerate(sub_queries, 1):
                 print(f"  {i}. {sub_query}")
 
-        # Process the complete query through the pipeline
+        # Process the complete query, reusing the decomposition for retrieval
         print("\n2. Generated Response:")
         print("-" * 40)
         with timeout(60):  # Set 60-second timeout for response generation
-            response = pipeline.process_query(query)
+            response = pipeline.process_query(query, sub_queries=sub_queries)
             print(response)
 
     except TimeoutException:
@@ -0,0 +1,101 @@
+import json
+import os
+import sys
+
+# Ensure the parent directory is in sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.rag_utils import ResponseGenerator
+
+
+class FakeResponse:
+    """Streamed response replaying fixed server-sent event lines."""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode=False):
+        # Like requests for an event stream sent without a charset
+        if decode_unicode:
+            return (line.decode("iso-8859-1") for line in self.lines)
+        return iter(self.lines)
+
+
+class FakeSession:
+    """Session answering every post with the same event lines."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.requests = []
+
+    def post(self, endpoint, headers=None, json=None, stream=False):
+        self.requests.append(json)
+        return FakeResponse(self.lines)
+
+
+def event(content=None) -> bytes:
+    """Encode one streamed chat delta as an SSE data line."""
+    delta = {} if content is None else {"content": content}
+    return b"data: " + json.dumps({"choices": [{"delta": delta}]}).encode()
+
+
+def make_generator(lines) -> ResponseGenerator:
+    """Build a response generator whose API calls return the given lines."""
+    generator = ResponseGenerator()
+    generator.session = FakeSession(lines)
+    return generator
+
+
+def test_stream_parses_events():
+    """Deltas are joined; keep-alives, empty deltas and [DONE] are handled."""
+    generator = make_generator(
+        [
+            event(),
+            b"",
+            b": keep-alive",
+            event("Move the "),
+            b"",
+            event("bras gauche, 30°"),
+            event(""),
+            b"data: [DONE]",
+            event("ignored"),
+        ]
+    )
+
+    response = "".join(generator.stream_response("q", [], history=[]))
+    assert response == "Move the bras gauche, 30°"
+
+
+def test_stream_keeps_utf8():
+    """Non-ASCII tokens are decoded as UTF-8, not ISO-8859-1."""
+    line = "data: " + json.dumps(
+        {"choices": [{"delta": {"content": "Épaule ✓"}}]}, ensure_ascii=False
+    )
+    generator = make_generator([line.encode("utf-8"), b"data: [DONE]"])
+
+    assert "".join(generator.stream_response("q", [], history=[])) == "Épaule ✓"
+
+
+def test_stream_history():
+    """The shared history is updated only when no history is passed in."""
+    generator = make_generator([event("answer"), b"data: [DONE]"])
+
+    list(generator.stream_response("q1", [], history=[]))
+    assert generator.conversation_history == []
+
+    list(generator.stream_response("q2", []))
+    assert [m["content"] for m in generator.conversation_history] == ["q2", "answer"]
+
+    history = [{"role": "user", "content": "earlier"}]
+    list(generator.stream_response("q3", [], history=history))
+    sent = generator.session.requests[-1]["messages"]
+    assert [m["content"] for m in sent[1:-1]] == ["earlier"]
@@ -1,9 +1,13 @@
 #!/usr/bin/env python
 
-import json
 import os
 from collections import defaultdict
-from typing import Dict, List, Set
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterator, List, Set
+
+import ijson
+import orjson
 
 # Paths
 RAW_DOCS_DIR = "data/raw_docs/extracted"
@@ -15,8 +19,34 @@ def load_json_file(filepath: str) -> List[Dict]:
     if not os.path.exists(filepath):
         print(f"Warning: File not found - {filepath}")
         return []
-    with open(filepath, "r") as f:
-        return json.load(f)
+    with open(filepath, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def iter_json_items(filepath: str) -> Iterator[Dict]:
+    """Stream the items of a JSON array file without loading it whole."""
+    if not os.path.exists(filepath):
+        print(f"Warning: File not found - {filepath}")
+        return
+    with open(filepath, "rb") as f:
+        yield from ijson.items(f, "item")
+
+
+def group_chunks_by_item(chunks: List[Dict], types: Set[str]) -> Dict[str, List[Dict]]:
+    """Group chunks of the given metadata types by their module.name key."""
+    rows = []
+    for chunk in chunks:
+        metadata = chunk.get("metadata", {})
+        if metadata.get("type") in types:
+            key = f"{metadata.get('module', '')}.{metadata.get('name', '')}"
+            rows.append((key, chunk))
+
+    # Sorting makes each item's chunks contiguous, so one groupby pass collects them
+    rows.sort(key=itemgetter(0))
+    return {
+        key: [chunk for _, chunk in group]
+        for key, group in groupby(rows, key=itemgetter(0))
+    }
 
 
 def analyze_api_coverage():
@@ -24,19 +54,16 @@ def analyze_api_coverage():
     print("\nAnalyzing API Documentation Coverage")
     print("=" * 80)
 
-    # Load raw API docs
-    raw_docs = load_json_file(os.path.join(RAW_DOCS_DIR, "raw_api_docs.json"))
-    if not raw_docs:
-        print("No raw API documentation found!")
-        return
-
-    # Count items in raw docs
+    # Count items in raw docs in a single streaming pass
     raw_counts = defaultdict(int)
     raw_items = defaultdict(set)
-    for item in raw_docs:
+    for item in iter_json_items(os.path.join(RAW_DOCS_DIR, "raw_api_docs.json")):
         item_type = item.get("type", "unknown")
         raw_counts[item_type] += 1
         raw_items[item_type].add(f"{item.get('module', '')}.{item.get('name', '')}")
+    if not raw_counts:
+        print("No raw API documentation found!")
+        return
 
     print("\nRaw Documentation Contents:")
     print("-" * 40)
@@ -64,23 +91,17 @@ def analyze_api_coverage():
             processed_items["module"].add(name)
 
     # Process classes (accounting for continuation chunks)
-    class_chunks = defaultdict(list)
-    for chunk in processed_classes:
-        metadata = chunk.get("metadata", {})
-        if metadata.get("type") == "class":
-            key = f"{metadata.get('module', '')}.{metadata.get('name', '')}"
-            class_chunks[key].append(chunk)
-            processed_items["class"].add(key)
+    class_chunks = group_chunks_by_item(processed_classes, {"class"})
+    for key in class_chunks:
+        processed_items["class"].add(key)
 
     # Process functions (accounting for implementation chunks)
-    function_chunks = defaultdict(list)
-    for chunk in processed_functions:
-        metadata = chunk.get("metadata", {})
-        if metadata.get("type") in ["function", "function_implementation"]:
-            key = f"{metadata.get('module', '')}.{metadata.get('name', '')}"
-            function_chunks[key].append(chunk)
-            if metadata.get("type") == "function":
-                processed_items["function"].add(key)
+    function_chunks = group_chunks_by_item(
+        processed_functions, {"function", "function_implementation"}
+    )
+    for key, chunks in function_chunks.items():
+        if any(chunk["metadata"]["type"] == "function" for chunk in chunks):
+            processed_items["function"].add(key)
 
     print("\nProcessed Documentation Contents:")
     print("-" * 40)
@@ -1,41 +1,163 @@
 #!/usr/bin/env python
 
+import argparse
+import hashlib
+import io
 import json
 import os
-from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
+from typing import Dict, Iterable, Iterator, List
 import re
 
+import ijson
+import orjson
+
 # Constants for chunking
 MAX_CHUNK_SIZE = 1500
 OVERLAP_SIZE = 300
 
+# A line opening a python code block (group 1 set) or closing any code block
+CODE_FENCE_RE = re.compile(r'^[^\S\n]*```(?:(python).*|[^\S\n]*)$', re.MULTILINE)
+
+# Whitespace patterns used by clean_text
+BLANK_LINES_RE = re.compile(r'\n\s*\n')
+MULTIPLE_SPACES_RE = re.compile(r' {2,}')
+
 # Input/Output paths
 RAW_DOCS_DIR = "data/raw_docs/extracted"
 OUTPUT_DIR = "data/external_docs/documents"
+# Kept beside OUTPUT_DIR, not in it, so cleaning the chunk files never drops it
+MANIFEST_PATH = os.path.join(os.path.dirname(OUTPUT_DIR), ".chunk_manifest.json")
+
+# Chunk files produced from each raw documentation file
+SOURCE_OUTPUTS = {
+    "raw_api_docs.json": [
+        "api_docs_modules.json",
+        "api_docs_classes.json",
+        "api_docs_functions.json",
+    ],
+    "raw_reachy2_docs.json": ["reachy2_docs.json"],
+    "raw_sdk_examples.json": ["reachy2_sdk.json"],
+    "raw_vision_examples.json": ["vision_examples.json"],
+    "raw_tutorials.json": ["reachy2_tutorials.json"],
+}
+
+# Description of each raw documentation file for progress messages
+SOURCE_LABELS = {
+    "raw_api_docs.json": "API documentation",
+    "raw_reachy2_docs.json": "Reachy 2 documentation",
+    "raw_sdk_examples.json": "SDK examples",
+    "raw_vision_examples.json": "Vision examples",
+    "raw_tutorials.json": "tutorials",
+}
 
 def load_json_file(filepath: str) -> List[Dict]:
     """Load a JSON file containing raw documents."""
     if not os.path.exists(filepath):
         print(f"Warning: File not found - {filepath}")
         return []
-    with open(filepath, 'r') as f:
-        return json.load(f)
+    with open(filepath, 'rb') as f:
+        return orjson.loads(f.read())
+
+def iter_json_items(filepath: str) -> Iterator[Dict]:
+    """Stream the documents of a raw JSON file one at a time."""
+    if not os.path.exists(filepath):
+        print(f"Warning: File not found - {filepath}")
+        return
+    with open(filepath, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+def dedupe_chunks(chunks: List[Dict]) -> List[Dict]:
+    """Drop chunks whose content repeats an earlier chunk, keeping the first."""
+    seen = set()
+    unique = []
+    for chunk in chunks:
+        key = hashlib.blake2b(chunk['content'].encode(), digest_size=16).digest()
+        if key not in seen:
+            seen.add(key)
+            unique.append(chunk)
+    if len(unique) < len(chunks):
+        renumber_chunks(unique)
+    return unique
+
+def renumber_chunks(chunks: List[Dict]):
+    """Make chunk indices, totals and code parts contiguous again after dropping chunks."""
+    groups = {}
+    blocks = {}
+    for chunk in chunks:
+        metadata = chunk['metadata']
+        if 'chunk_index' not in metadata:
+            continue
+        if 'total_parts' in metadata:
+            # Parts of one split code block were appended one after another,
+            # so chunk_index - code_part is the same for all of them
+            blocks.setdefault(metadata['chunk_index'] - metadata['code_part'], []).append(metadata)
+        if 'total_chunks' in metadata:
+            # Parts of one split function are numbered within their source
+            groups.setdefault(metadata['source'], []).append(metadata)
+        else:
+            # Other chunks are numbered by position in the collection
+            groups.setdefault(None, []).append(metadata)
+    
+    for source, group in groups.items():
+        for i, metadata in enumerate(group):
+            metadata['chunk_index'] = i
+            if source is not None:
+                metadata['total_chunks'] = len(group)
+    
+    for parts in blocks.values():
+        for i, metadata in enumerate(parts):
+            metadata['code_part'] = i + 1
+            metadata['total_parts'] = len(parts)
 
 def save_chunks(chunks: List[Dict], filepath: str):
     """Save chunks to a JSON file."""
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w') as f:
-        json.dump(chunks, f, indent=2)
+    # Identical chunks would only be embedded and retrieved twice
+    unique = dedupe_chunks(chunks)
+    if len(unique) < len(chunks):
+        print(f"Dropped {len(chunks) - len(unique)} duplicate chunks")
+    chunks = unique
+    
+    # Encode straight to UTF-8 bytes in memory and write them once. Unlike
+    # json.dump, non-ASCII text is written unescaped, so readers must open
+    # these files as UTF-8
+    data = orjson.dumps(chunks, option=orjson.OPT_INDENT_2)
+    with open(filepath, 'wb') as f:
+        f.write(data)
     print(f"Saved {len(chunks)} chunks to {filepath}")
 
+def source_fingerprint(filepath: str) -> str:
+    """Hash a raw file together with the chunking code and settings."""
+    digest = hashlib.sha256()
+    for path in (filepath, __file__):
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    digest.update(f"{MAX_CHUNK_SIZE}:{OVERLAP_SIZE}".encode())
+    return digest.hexdigest()
+
+def load_manifest() -> Dict[str, str]:
+    """Load the fingerprints of the raw files chunked by the previous run."""
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, 'r') as f:
+        return json.load(f)
+
+def save_manifest(manifest: Dict[str, str]):
+    """Save the fingerprints of the raw files chunked by this run."""
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
 def clean_text(text: str) -> str:
     """Clean text by removing extra whitespace and normalizing newlines."""
     # Replace multiple newlines with a single newline
-    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = BLANK_LINES_RE.sub('\n\n', text)
     # Replace single newlines with spaces
-    text = re.sub(r'\n', ' ', text)
+    text = text.replace('\n', ' ')
     # Replace multiple spaces with a single space
-    text = re.sub(r' +', ' ', text)
+    text = MULTIPLE_SPACES_RE.sub(' ', text)
     return text.strip()
 
 def split_text(text: str, max_chunk_size: int = MAX_CHUNK_SIZE, overlap_size: int = OVERLAP_SIZE) -> List[str]:
@@ -86,12 +208,17 @@ def split_text(text: str, max_chunk_size: int = MAX_CHUNK_SIZE, overlap_size: in
         if chunk:
             chunks.append(chunk)
         
+        # The last chunk reached the end; stepping on would only emit ever
+        # shorter copies of its tail
+        if end >= len(text):
+            break
+        
         # Calculate next start position with overlap
         start = max(start + 1, end - overlap_size)
     
     return chunks
 
-def chunk_api_docs(raw_docs: List[Dict]) -> Dict[str, List[Dict]]:
+def chunk_api_docs(raw_docs: Iterable[Dict]) -> Dict[str, List[Dict]]:
     """Process API documentation into chunks with appropriate context."""
     chunks = {
         'modules': [],  # Add module-level documentation
@@ -103,21 +230,24 @@ def chunk_api_docs(raw_docs: List[Dict]) -> Dict[str, List[Dict]]:
         try:
             if item['type'] == 'module':
                 # Process module documentation
-                content = f"Module: {item['name']}\n\n"
+                name = item['name']
+                content = f"Module: {name}\n\n"
                 content += f"Documentation:\n{item.get('docstring', 'No documentation available.')}\n"
                 
                 chunks['modules'].append({
                     'content': content,
                     'metadata': {
-                        'source': item['name'],
+                        'source': name,
                         'type': 'module',
-                        'name': item['name']
+                        'name': name
                     }
                 })
             
             elif item['type'] == 'class':
                 # Create main class chunk with overview
-                class_content = f"Class: {item['name']}\nModule: {item['module']}\n\n"
+                name = item['name']
+                module = item['module']
+                class_content = f"Class: {name}\nModule: {module}\n\n"
                 class_content += f"Documentation:\n{item.get('docstring', 'No documentation available.')}\n"
                 
                 # Add method summary
@@ -130,10 +260,10 @@ def chunk_api_docs(raw_docs: List[Dict]) -> Dict[str, List[Dict]]:
                 chunks['classes'].append({
                     'content': class_content,
                     'metadata': {
-                        'source': f"{item['module']}.{item['name']}",
+                        'source': f"{module}.{name}",
                         'type': 'class',
-                        'name': item['name'],
-                        'module': item['module'],
+                        'name': name,
+                        'module': module,
                         'chunk_type': 'overview'
                     }
                 })
@@ -141,9 +271,10 @@ def chunk_api_docs(raw_docs: List[Dict]) -> Dict[str, List[Dict]]:
                 # Add individual method chunks
                 if 'methods' in item:
                     for method in item['methods']:
-                        method_content = f"Method: {method['name']}\n"
-                        method_content += f"Class: {item['name']}\n"
-                        method_content += f"Module: {item['module']}\n\n"
+                        method_name = method['name']
+                        method_content = f"Method: {method_name}\n"
+                        method_content += f"Class: {name}\n"
+                        method_content += f"Module: {module}\n\n"
                         
                         if 'signature' in method:
                             method_content += f"Signature: {method['signature']}\n\n"
@@ -155,21 +286,23 @@ def chunk_api_docs(raw_docs: List[Dict]) -> Dict[str, List[Dict]]:
                         chunks['classes'].append({
                             'content': method_content,
                             'metadata': {
-                                'source': f"{item['module']}.{item['name']}.{method['name']}",
+                                'source': f"{module}.{name}.{method_name}",
                                 'type': 'class',
-                                'name': item['name'],
-                                'module': item['module'],
-                                'method': method['name'],
+                                'name': name,
+                                'module': module,
+                                'method': method_name,
                                 'chunk_type': 'method'
                             }
                         })
             
             elif item['type'] == 'function':
                 # Process standalone functions (not class methods)
-                function_content = f"Function: {item['name']}"
+                name = item['name']
+                function_content = f"Function: {name}"
                 if 'signature' in item:
                     function_content += f"{item['signature']}\n"
-                function_content += f"Module: {item['module']}\n\n"
+                module = item['module']
+                function_content += f"Module: {module}\n\n"
                 
                 if 'docstring' in item:
                     function_content += f"Documentation:\n{item['docstring']}\n"
@@ -183,10 +316,10 @@ def chunk_api_docs(raw_docs: List[Dict]) -> Dict[str, List[Dict]]:
                     chunks['functions'].append({
                         'content': chunk,
                         'metadata': {
-                            'source': f"{item['module']}.{item['name']}",
+                            'source': f"{module}.{name}",
                             'type': 'function',
-                            'name': item['name'],
-                            'module': item['module'],
+                            'name': name,
+                            'module': module,
                             'chunk_index': i,
                             'total_chunks': len(function_chunks)
                         }
@@ -202,41 +335,55 @@ def chunk_api_docs(raw_docs: List[Dict]) -> Dict[str, List[Dict]]:
 def extract_code_blocks(text: str) -> List[Dict]:
     """Extract code blocks and their surrounding context from text."""
     blocks = []
-    lines = text.split('\n')
     current_context = []
     current_code = []
     in_code_block = False
+    pos = 0
     
-    for line in lines:
-        if line.strip().startswith('```python'):
+    # Only fence lines need a decision; the lines between two fences all go
+    # to the same side, so they are sliced out in one piece
+    for match in CODE_FENCE_RE.finditer(text):
+        lines = text[pos:match.start()].split('\n')[:-1]
+        if in_code_block:
+            current_code.extend(lines)
+        else:
+            current_context.extend(lines)
+        pos = match.end() + 1
+        
+        if match.group(1):
             in_code_block = True
             if current_context:
                 blocks.append({'context': current_context, 'code': []})
                 current_context = []
-        elif line.strip() == '```' and in_code_block:
+        elif in_code_block:
             in_code_block = False
             if current_code:
                 blocks.append({'context': current_context, 'code': current_code})
                 current_context = []
                 current_code = []
-        elif in_code_block:
-            current_code.append(line)
         else:
-            current_context.append(line)
+            # A closing fence outside a python block is plain text
+            current_context.append(match.group())
     
-    # Add any remaining content
+    # Add any remaining content; an unclosed code block is dropped
+    if not in_code_block and pos <= len(text):
+        current_context.extend(text[pos:].split('\n'))
     if current_context:
         blocks.append({'context': current_context, 'code': []})
     
     return blocks
 
-def chunk_markdown_docs(raw_docs: List[Dict]) -> List[Dict]:
-    """Process markdown documentation into semantic chunks."""
+def chunk_markdown_docs(raw_docs: List[Dict], verbose: bool = False) -> List[Dict]:
+    """Process markdown documentation into semantic chunks.
+    
+    With verbose=True, per-document and per-section progress is printed.
+    """
     chunks = []
     
     for doc in raw_docs:
         try:
-            print(f"\nProcessing document: {doc.get('metadata', {}).get('source', 'unknown')}")
+            if verbose:
+                print(f"\nProcessing document: {doc.get('metadata', {}).get('source', 'unknown')}")
             content = doc['content']
             metadata = doc['metadata']
             
@@ -247,7 +394,8 @@ def chunk_markdown_docs(raw_docs: List[Dict]) -> List[Dict]:
             lines = content.split('\n')
             
             # Debug: Print initial content size
-            print(f"Document size: {len(content)} characters")
+            if verbose:
+                print(f"Document size: {len(content)} characters")
             
             for line in lines:
                 try:
@@ -265,7 +413,8 @@ def chunk_markdown_docs(raw_docs: List[Dict]) -> List[Dict]:
                                     'content': section_content,
                                     'headers': list(header_stack)
                                 })
-                                print(f"Created section with {len(section_content)} chars at header: {line.strip()}")
+                                if verbose:
+                                    print(f"Created section with {len(section_content)} chars at header: {line.strip()}")
                                 current_section = []
                             
                         # Update header stack
@@ -289,9 +438,11 @@ def chunk_markdown_docs(raw_docs: List[Dict]) -> List[Dict]:
                         'content': section_content,
                         'headers': list(header_stack)
                     })
-                    print(f"Created final section with {len(section_content)} chars")
+                    if verbose:
+                        print(f"Created final section with {len(section_content)} chars")
             
-            print(f"Found {len(sections)} sections")
+            if verbose:
+                print(f"Found {len(sections)} sections")
             
             # Process each section
             for i, section in enumerate(sections):
@@ -382,7 +533,8 @@ def chunk_markdown_docs(raw_docs: List[Dict]) -> List[Dict]:
                     print(f"Error processing section {i}: {str(e)}")
                     continue
             
-            print(f"Created {len(chunks)} chunks")
+            if verbose:
+                print(f"Created {len(chunks)} chunks")
             
         except Exception as e:
             print(f"Error processing document {doc.get('metadata', {}).get('source', 'unknown')}: {str(e)}")
@@ -407,6 +559,7 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                 
                 current_chunk = []
                 current_size = 0
+                current_has_code = False  # Whether current_chunk holds a code block
                 
                 for block in blocks:
                     # Format block content
@@ -424,11 +577,12 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                             'metadata': {
                                 **metadata,
                                 'chunk_index': len(chunks),
-                                'has_code': '```python' in chunk_content
+                                'has_code': current_has_code
                             }
                         })
                         current_chunk = []
                         current_size = 0
+                        current_has_code = False
                     
                     # If single block is too big, split it
                     if block_size > max_chunk_size:
@@ -452,6 +606,7 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                     else:
                         current_chunk.append(block_text)
                         current_size += block_size
+                        current_has_code = current_has_code or bool(block['code'])
                 
                 # Save any remaining content
                 if current_chunk:
@@ -461,7 +616,7 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                         'metadata': {
                             **metadata,
                             'chunk_index': len(chunks),
-                            'has_code': '```python' in chunk_content
+                            'has_code': current_has_code
                         }
                     })
             
@@ -470,6 +625,7 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                 blocks = extract_code_blocks(content)
                 current_chunk = []
                 current_size = 0
+                current_has_code = False  # Whether current_chunk holds a code block
                 
                 for block in blocks:
                     block_text = '\n'.join(block['context'])
@@ -484,11 +640,12 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                             'metadata': {
                                 **metadata,
                                 'chunk_index': len(chunks),
-                                'has_code': any('```python' in block for block in current_chunk)
+                                'has_code': current_has_code
                             }
                         })
                         current_chunk = []
                         current_size = 0
+                        current_has_code = False
                     
                     if block_size > max_chunk_size:
                         # Keep context with first part of code
@@ -511,6 +668,7 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                     else:
                         current_chunk.append(block_text)
                         current_size += block_size
+                        current_has_code = current_has_code or bool(block['code'])
                 
                 if current_chunk:
                     chunks.append({
@@ -518,7 +676,7 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
                         'metadata': {
                             **metadata,
                             'chunk_index': len(chunks),
-                            'has_code': any('```python' in block for block in current_chunk)
+                            'has_code': current_has_code
                         }
                     })
         
@@ -528,58 +686,104 @@ def chunk_examples(raw_docs: List[Dict], collection: str) -> List[Dict]:
     
     return chunks
 
+def process_source(source: str, verbose: bool = False):
+    """Chunk one raw documentation file and save its chunk files."""
+    source_path = os.path.join(RAW_DOCS_DIR, source)
+    if source == "raw_api_docs.json":
+        # Stream the largest raw file so only one raw item is held at a time,
+        # counting the items as they go by
+        count = 0
+        def counted(items):
+            nonlocal count
+            for item in items:
+                count += 1
+                yield item
+        chunks = chunk_api_docs(counted(iter_json_items(source_path)))
+        if not count:
+            return
+        print(f"Found {count} API documents")
+        save_chunks(chunks['modules'], os.path.join(OUTPUT_DIR, "api_docs_modules.json"))
+        save_chunks(chunks['classes'], os.path.join(OUTPUT_DIR, "api_docs_classes.json"))
+        save_chunks(chunks['functions'], os.path.join(OUTPUT_DIR, "api_docs_functions.json"))
+        return
+    
+    raw_docs = load_json_file(source_path)
+    if not raw_docs:
+        return
+    
+    if source == "raw_reachy2_docs.json":
+        print(f"Found {len(raw_docs)} Reachy 2 documents")
+        chunks = chunk_markdown_docs(raw_docs, verbose)
+        save_chunks(chunks, os.path.join(OUTPUT_DIR, "reachy2_docs.json"))
+    else:
+        # Example collections are named after their chunk file
+        output = SOURCE_OUTPUTS[source][0]
+        print(f"Found {len(raw_docs)} {SOURCE_LABELS[source]}")
+        chunks = chunk_examples(raw_docs, os.path.splitext(output)[0])
+        save_chunks(chunks, os.path.join(OUTPUT_DIR, output))
+
+def chunk_source(source: str, verbose: bool = False) -> str:
+    """Chunk one raw documentation file in a worker process and return its log."""
+    report = io.StringIO()
+    with redirect_stdout(report):
+        process_source(source, verbose)
+    return report.getvalue()
+
 def main():
     """Process all raw documents into chunks."""
+    parser = argparse.ArgumentParser(description="Chunk the raw documentation.")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print per-document and per-section progress while chunking",
+    )
+    args = parser.parse_args()
+    
     print("\nProcessing raw documentation into chunks...")
+    # Every chunk file and the manifest go here, so create it once up front
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
+    # Raw files whose contents, chunking code and settings match the previous
+    # run keep their existing chunk files
+    manifest = load_manifest()
+    fingerprints = {}
+    unchanged = set()
+    for source, outputs in SOURCE_OUTPUTS.items():
+        source_path = os.path.join(RAW_DOCS_DIR, source)
+        if not os.path.exists(source_path):
+            continue
+        fingerprints[source] = source_fingerprint(source_path)
+        if manifest.get(source) == fingerprints[source] and all(
+            os.path.exists(os.path.join(OUTPUT_DIR, output)) for output in outputs
+        ):
+            unchanged.add(source)
+    kept_outputs = {output for source in unchanged for output in SOURCE_OUTPUTS[source]}
     
     # Clean up existing chunked documents
     print("\nCleaning up existing chunked documents...")
-    if os.path.exists(OUTPUT_DIR):
-        for file in os.listdir(OUTPUT_DIR):
-            if file.endswith('.json'):
-                os.remove(os.path.join(OUTPUT_DIR, file))
+    for file in os.listdir(OUTPUT_DIR):
+        if file.endswith('.json') and file not in kept_outputs:
+            os.remove(os.path.join(OUTPUT_DIR, file))
     
-    # Process API documentation
-    print("\nProcessing API documentation...")
-    api_docs = load_json_file(os.path.join(RAW_DOCS_DIR, "raw_api_docs.json"))
-    if api_docs:
-        print(f"Found {len(api_docs)} API documents")
-        chunks = chunk_api_docs(api_docs)
-        save_chunks(chunks['modules'], os.path.join(OUTPUT_DIR, "api_docs_modules.json"))
-        save_chunks(chunks['classes'], os.path.join(OUTPUT_DIR, "api_docs_classes.json"))
-        save_chunks(chunks['functions'], os.path.join(OUTPUT_DIR, "api_docs_functions.json"))
-    
-    # Process Reachy 2 documentation
-    print("\nProcessing Reachy 2 documentation...")
-    reachy2_docs = load_json_file(os.path.join(RAW_DOCS_DIR, "raw_reachy2_docs.json"))
-    if reachy2_docs:
-        print(f"Found {len(reachy2_docs)} Reachy 2 documents")
-        chunks = chunk_markdown_docs(reachy2_docs)
-        save_chunks(chunks, os.path.join(OUTPUT_DIR, "reachy2_docs.json"))
+    # Raw files are chunked independently, so process them in parallel and
+    # print their logs in the usual order
+    pending = [source for source in SOURCE_OUTPUTS if source not in unchanged]
+    reports = {}
+    if pending:
+        with ProcessPoolExecutor(min(len(pending), os.cpu_count() or 1)) as executor:
+            worker = partial(chunk_source, verbose=args.verbose)
+            reports = dict(zip(pending, executor.map(worker, pending)))
     
-    # Process SDK examples
-    print("\nProcessing SDK examples...")
-    sdk_examples = load_json_file(os.path.join(RAW_DOCS_DIR, "raw_sdk_examples.json"))
-    if sdk_examples:
-        print(f"Found {len(sdk_examples)} SDK examples")
-        chunks = chunk_examples(sdk_examples, "reachy2_sdk")
-        save_chunks(chunks, os.path.join(OUTPUT_DIR, "reachy2_sdk.json"))
-    
-    # Process Vision examples
-    print("\nProcessing Vision examples...")
-    vision_examples = load_json_file(os.path.join(RAW_DOCS_DIR, "raw_vision_examples.json"))
-    if vision_examples:
-        print(f"Found {len(vision_examples)} Vision examples")
-        chunks = chunk_examples(vision_examples, "vision_examples")
-        save_chunks(chunks, os.path.join(OUTPUT_DIR, "vision_examples.json"))
+    for source, label in SOURCE_LABELS.items():
+        print(f"\nProcessing {label}...")
+        if source in unchanged:
+            print("Unchanged since the last run, keeping existing chunks")
+        else:
+            print(reports[source], end="")
     
-    # Process tutorials
-    print("\nProcessing tutorials...")
-    tutorials = load_json_file(os.path.join(RAW_DOCS_DIR, "raw_tutorials.json"))
-    if tutorials:
-        print(f"Found {len(tutorials)} tutorials")
-        chunks = chunk_examples(tutorials, "reachy2_tutorials")
-        save_chunks(chunks, os.path.join(OUTPUT_DIR, "reachy2_tutorials.json"))
+    # Remember what was chunked so unchanged files are skipped next time
+    if fingerprints:
+        save_manifest(fingerprints)
     
     print("\nChunking process complete!")
 
@@ -11,7 +11,10 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional, get_type_hints
 
-import nbformat
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.doc_utils import process_files_in_parallel
+from src.utils.notebook_utils import read_notebook_cells
 
 # Repository and directory configuration
 GIT_URL = "https://github.com/pollen-robotics/reachy2-sdk.git"
@@ -86,16 +89,15 @@ def process_python_file(file_path: str) -> Dict:
 def process_notebook_file(file_path: str) -> Dict:
     """Process a Jupyter notebook into a document."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            nb = nbformat.read(f, as_version=4)
+        cells = read_notebook_cells(file_path)
 
         # Extract markdown and code cells
         content = []
-        for cell in nb.cells:
-            if cell.cell_type == "markdown":
-                content.append(f"# {cell.source}")
-            elif cell.cell_type == "code":
-                content.append(f"```python\n{cell.source}\n```")
+        for cell_type, source in cells:
+            if cell_type == "markdown":
+                content.append(f"# {source}")
+            elif cell_type == "code":
+                content.append(f"```python\n{source}\n```")
 
         # Get relative path for source tracking
         rel_path = os.path.relpath(file_path, REPO_DIR)
@@ -118,6 +120,13 @@ def process_notebook_file(file_path: str) -> Dict:
         return None
 
 
+def process_example_file(file_path: str) -> Optional[Dict]:
+    """Process a Python or notebook example into a document."""
+    if file_path.endswith(".py"):
+        return process_python_file(file_path)
+    return process_notebook_file(file_path)
+
+
 def collect_sdk_examples() -> List[Dict]:
     """Collect examples from the SDK repository."""
     print("\nCollecting SDK examples...")
@@ -128,25 +137,21 @@ def collect_sdk_examples() -> List[Dict]:
         return examples
 
     # Walk through the examples directory
+    file_paths = []
     for root, _, files in os.walk(EXAMPLES_SOURCE_DIR):
         for file in sorted(files):  # Sort files to process in a consistent order
-            if not (file.endswith(".py") or file.endswith(".ipynb")):
-                continue
-
-            file_path = os.path.join(root, file)
-            print(f"Processing: {file}")
-
-            if file.endswith(".py"):
-                doc = process_python_file(file_path)
-                if doc:
-                    examples.append(doc)
-                    print(f"Added Python example: {file}")
-
-            elif file.endswith(".ipynb"):
-                doc = process_notebook_file(file_path)
-                if doc:
-                    examples.append(doc)
-                    print(f"Added notebook example: {file}")
+            if file.endswith(".py") or file.endswith(".ipynb"):
+                file_paths.append(os.path.join(root, file))
+
+    docs = process_files_in_parallel(process_example_file, file_paths)
+
+    for file_path, doc in zip(file_paths, docs):
+        file = os.path.basename(file_path)
+        print(f"Processing: {file}")
+        if doc:
+            examples.append(doc)
+            kind = "Python" if file.endswith(".py") else "notebook"
+            print(f"Added {kind} example: {file}")
 
     print(f"Collected {len(examples)} examples")
     return examples
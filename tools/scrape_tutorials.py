@@ -7,7 +7,10 @@ import sys
 import time
 from pathlib import Path
 
-import nbformat
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.doc_utils import process_files_in_parallel
+from src.utils.notebook_utils import read_notebook_cells
 
 # Repository and directory configuration
 GIT_URL = "https://github.com/pollen-robotics/reachy2-tutorials.git"
@@ -71,25 +74,24 @@ def clone_or_update_repo():
 def process_notebook_file(file_path: str) -> dict:
     """Process a Jupyter notebook into a document."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            nb = nbformat.read(f, as_version=4)
+        cells = read_notebook_cells(file_path)
 
         # Extract markdown and code cells
         content = []
-        for cell in nb.cells:
-            if cell.cell_type == "markdown":
-                content.append(f"### Tutorial Explanation:\n{cell.source}")
-            elif cell.cell_type == "code":
-                content.append(f"### Code Example:\n```python\n{cell.source}\n```")
+        for cell_type, source in cells:
+            if cell_type == "markdown":
+                content.append(f"### Tutorial Explanation:\n{source}")
+            elif cell_type == "code":
+                content.append(f"### Code Example:\n```python\n{source}\n```")
 
         # Get relative path for source tracking
         rel_path = os.path.relpath(file_path, REPO_DIR)
 
         # Get notebook title from filename or first heading
         title = os.path.splitext(os.path.basename(file_path))[0]
-        for cell in nb.cells:
-            if cell.cell_type == "markdown" and cell.source.startswith("#"):
-                title = cell.source.split("\n")[0].lstrip("#").strip()
+        for cell_type, source in cells:
+            if cell_type == "markdown" and source.startswith("#"):
+                title = source.split("\n")[0].lstrip("#").strip()
                 break
 
         return {
@@ -117,18 +119,20 @@ def collect_tutorials() -> list:
         return tutorials
 
     # Walk through the repository
+    file_paths = []
     for root, _, files in os.walk(REPO_DIR):
         for file in sorted(files):  # Sort files to process in a consistent order
-            if not file.endswith(".ipynb"):
-                continue
+            if file.endswith(".ipynb"):
+                file_paths.append(os.path.join(root, file))
 
-            file_path = os.path.join(root, file)
-            print(f"Processing: {file}")
+    docs = process_files_in_parallel(process_notebook_file, file_paths)
 
-            doc = process_notebook_file(file_path)
-            if doc:
-                tutorials.append(doc)
-                print(f"Added tutorial: {file}")
+    for file_path, doc in zip(file_paths, docs):
+        file = os.path.basename(file_path)
+        print(f"Processing: {file}")
+        if doc:
+            tutorials.append(doc)
+            print(f"Added tutorial: {file}")
 
     print(f"Collected {len(tutorials)} tutorials")
     return tutorials
@@ -11,6 +11,10 @@ import time
 from pathlib import Path
 from typing import Dict, List, Optional, get_type_hints
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.utils.notebook_utils import read_notebook_cells
+
 # Repository and directory configuration
 GIT_URL = "https://github.com/pollen-robotics/pollen-vision.git"
 
@@ -227,6 +231,17 @@ def get_parameters(node: ast.FunctionDef) -> Dict[str, str]:
     return params
 
 
+def notebook_to_text(file_path: str) -> str:
+    """Extract a notebook's markdown and code cells, dropping outputs and metadata."""
+    content = []
+    for cell_type, source in read_notebook_cells(file_path):
+        if cell_type == "markdown":
+            content.append(source)
+        elif cell_type == "code":
+            content.append(f"```python\n{source}\n```")
+    return "\n\n".join(content)
+
+
 def collect_examples() -> List[Dict]:
     """Collect examples from the examples directory."""
     print("\nCollecting examples...")
@@ -258,11 +273,10 @@ def collect_examples() -> List[Dict]:
                         print(f"Found Python example: {rel_path}")
 
                     elif file.endswith(".ipynb"):
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
+                        # Cell outputs (images, logs) are not useful for retrieval
                         examples.append(
                             {
-                                "content": content,
+                                "content": notebook_to_text(file_path),
                                 "metadata": {
                                     "source": rel_path,
                                     "type": "example",